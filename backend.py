@@ -1,9 +1,416 @@
+import hashlib
+import json
+import os
+import time
+from collections import OrderedDict
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, as_completed, wait
+from functools import partial
+from itertools import product
+from multiprocessing import Manager
+
 import numpy as np
 
+try:
+    from numba import njit
+except ImportError:  # numba opsional, tanpa numba hanya backend "numpy" yang tersedia
+    njit = None
+
+
+def _cost_kernel(
+    nurse_array, minimum_shift, transition_lengths, transition_offsets, transition_penalty
+):
+    """Kernel cost NSP yang menghitung seluruh constraint dalam satu loop
+    (tanpa array index sementara). Dikompilasi dengan numba jika tersedia.
+
+    Args:
+        nurse_array (np.ndarray): Jadwal perawat (Perawat x Hari)
+        minimum_shift (np.ndarray): Jumlah minimum perawat tiap shift (float64, 3)
+        transition_lengths (np.ndarray): Panjang pola transisi pada tabel penalti
+        transition_offsets (np.ndarray): Offset kode tiap panjang pola
+        transition_penalty (np.ndarray): Tabel penalti (Kode x Aturan)
+
+    Returns:
+        breakdown: Cost tiap constraint (float64, urutan constraint_names)
+    """
+    total_nurse, day = nurse_array.shape
+    total_code, total_rule = transition_penalty.shape
+    breakdown = np.zeros(2 + total_rule)
+    shift_count = np.zeros((day, 3))
+    histogram = np.zeros(total_code)
+    shift_code = np.empty(day, dtype=np.int64)
+    # Kode pola berjalan (basis 5) untuk tiap panjang pola
+    rolling_code = np.zeros(transition_lengths.shape[0], dtype=np.int64)
+    modulus = 5 ** transition_lengths
+    for n in range(total_nurse):
+        rolling_code[:] = 0
+        for d in range(day):
+            shift = nurse_array[n, d]
+            if shift == 0:
+                code = 0
+            elif shift == 1:
+                code = 1
+            elif shift == 2:
+                code = 2
+            elif shift == 3:
+                code = 3
+            else:
+                code = 4
+            shift_code[d] = code
+            if code < 3:
+                shift_count[d, code] += 1
+            for k in range(transition_lengths.shape[0]):
+                length = transition_lengths[k]
+                rolling_code[k] = rolling_code[k] * 5 + code
+                if d >= length:
+                    rolling_code[k] -= shift_code[d - length] * modulus[k]
+                if d + 1 >= length:
+                    histogram[transition_offsets[k] + rolling_code[k]] += 1
+    for code in range(total_code):
+        if histogram[code] != 0:
+            for r in range(total_rule):
+                breakdown[2 + r] += histogram[code] * transition_penalty[code, r]
+    for d in range(day):
+        for shift in range(3):
+            breakdown[0] += max(minimum_shift[shift] - shift_count[d, shift], 0.0)
+    return breakdown
+
+
+def _cost_batch_kernel(
+    nurse_arrays, minimum_shift, transition_lengths, transition_offsets, transition_penalty
+):
+    """Kernel cost untuk satu populasi jadwal (Populasi x Perawat x Hari)
+
+    Returns:
+        breakdown: Cost tiap constraint tiap jadwal (Populasi x Constraint)
+    """
+    breakdown = np.zeros((nurse_arrays.shape[0], 2 + transition_penalty.shape[1]))
+    for p in range(nurse_arrays.shape[0]):
+        breakdown[p] = _cost_kernel(
+            nurse_arrays[p],
+            minimum_shift,
+            transition_lengths,
+            transition_offsets,
+            transition_penalty,
+        )
+    return breakdown
+
+
+if njit is not None:
+    _cost_kernel = njit(cache=True, nogil=True)(_cost_kernel)
+    _cost_batch_kernel = njit(cache=True, nogil=True)(_cost_batch_kernel)
+
+
+def to_shift_code(nurse_array) -> np.ndarray:
+    """Fungsi untuk mengubah jadwal menjadi kode shift compact (uint8). Nilai yang
+    bukan kode shift (pecahan atau di luar 0-3) diberi kode 4 (tidak termasuk shift apapun)
+
+    Args:
+        nurse_array (np.ndarray): Jadwal perawat (float, int, uint8, atau PackedSchedule)
+
+    Returns:
+        shift_code: Jadwal dengan kode 0 1 2 3 4 (uint8)
+    """
+    nurse_array = np.asarray(nurse_array)
+    if nurse_array.dtype == np.uint8:
+        return np.minimum(nurse_array, 4)
+    if np.issubdtype(nurse_array.dtype, np.integer):
+        return np.where(
+            (nurse_array >= 0) & (nurse_array < 4), nurse_array, 4
+        ).astype(np.uint8)
+    shift_code = np.full(nurse_array.shape, 4, dtype=np.uint8)
+    for shift in range(4):
+        shift_code[nurse_array == shift] = shift
+    return shift_code
+
+
+def shift_label(nurse_array) -> np.ndarray:
+    """Fungsi untuk mengubah kode shift menjadi label shift
+
+    Args:
+        nurse_array (np.ndarray): Jadwal berkode 0 1 2 3
+
+    Returns:
+        nurse_array: Jadwal berlabel Pagi, Sore, Malam, Libur
+    """
+    nurse_array = np.asarray(nurse_array).astype(int)
+    nurse_array = np.where(nurse_array.astype(str)=="0","Pagi",nurse_array.astype(str))
+    nurse_array = np.where(nurse_array.astype(str)=="1","Sore",nurse_array.astype(str))
+    nurse_array = np.where(nurse_array.astype(str)=="2","Malam",nurse_array.astype(str))
+    nurse_array = np.where(nurse_array.astype(str)=="3","Libur",nurse_array.astype(str))
+    return nurse_array
+
+
+def from_shift_label(nurse_array) -> np.ndarray:
+    """Fungsi untuk mengubah jadwal berlabel shift (misal hasil optimasi bulan lalu)
+    menjadi kode shift compact (uint8), jadwal yang sudah berkode diubah dengan
+    to_shift_code
+
+    Args:
+        nurse_array (np.ndarray): Jadwal berlabel Pagi, Sore, Malam, Libur atau
+            berkode 0 1 2 3
+
+    Returns:
+        shift_code: Jadwal dengan kode 0 1 2 3 4 (uint8)
+    """
+    nurse_array = np.asarray(nurse_array)
+    if nurse_array.dtype.kind not in "OUS":
+        return to_shift_code(nurse_array)
+    nurse_array = nurse_array.astype(str)
+    shift_code = np.full(nurse_array.shape, 4, dtype=np.uint8)
+    for shift, label in enumerate(("Pagi", "Sore", "Malam", "Libur")):
+        shift_code[(nurse_array == label) | (nurse_array == str(shift))] = shift
+    return shift_code
+
+
+class PackedSchedule:
+    def __init__(self, packed: np.ndarray, shape: tuple) -> None:
+        """Class jadwal (atau populasi jadwal) dalam bentuk 2-bit packed, 4 sel per
+        byte, untuk menyimpan populasi dan arsip dengan memori kecil.
+        Dapat langsung dipakai oleh numpy (np.asarray) sehingga juga dapat langsung
+        dihitung cost-nya.
+
+        Args:
+            packed (np.ndarray): Array uint8 hasil packing
+            shape (tuple): Bentuk jadwal asli
+        """
+        self.packed = packed
+        self.shape = tuple(shape)
+
+    @classmethod
+    def pack(cls, nurse_array) -> "PackedSchedule":
+        """Fungsi untuk membuat PackedSchedule dari jadwal berkode 0 1 2 3
+
+        Args:
+            nurse_array (np.ndarray): Jadwal atau populasi jadwal
+
+        Returns:
+            packed_schedule: PackedSchedule
+        """
+        shift_code = to_shift_code(nurse_array)
+        if np.any(shift_code == 4):
+            raise ValueError("Jadwal packed hanya dapat berisi kode shift 0 1 2 3")
+        flat = shift_code.ravel()
+        flat = np.concatenate((flat, np.zeros(-flat.size % 4, dtype=np.uint8)))
+        flat = flat.reshape(-1, 4)
+        packed = flat[:, 0] | (flat[:, 1] << 2) | (flat[:, 2] << 4) | (flat[:, 3] << 6)
+        return cls(packed, shift_code.shape)
+
+    def unpack(self) -> np.ndarray:
+        """Fungsi untuk mengembalikan jadwal menjadi kode shift uint8
+
+        Returns:
+            shift_code: Jadwal (uint8) dengan bentuk asli
+        """
+        flat = (self.packed[:, None] >> np.array([0, 2, 4, 6], dtype=np.uint8)) & 3
+        return flat.ravel()[: int(np.prod(self.shape))].reshape(self.shape)
+
+    def __array__(self, dtype=None, copy=None) -> np.ndarray:
+        shift_code = self.unpack()
+        return shift_code if dtype is None else shift_code.astype(dtype)
+
+    def __len__(self) -> int:
+        return self.shape[0]
+
+    def __getitem__(self, index) -> np.ndarray:
+        """Fungsi untuk mengambil sebagian jadwal (index pada sumbu pertama). Hanya
+        byte milik baris yang diminta yang di-unpack, sehingga mengambil satu jadwal
+        dari arsip tidak bergantung pada ukuran arsip.
+        """
+        rest = ()
+        if isinstance(index, tuple):
+            index, rest = index[0], index[1:]
+        if isinstance(index, (int, np.integer, slice)):
+            rows = np.asarray(range(self.shape[0])[index])
+        else:
+            rows = np.arange(self.shape[0])[index]
+        row_size = int(np.prod(self.shape[1:]))
+        cells = rows[..., None] * row_size + np.arange(row_size)
+        shift_code = (self.packed[cells >> 2] >> ((cells & 3) << 1)) & 3
+        shift_code = shift_code.astype(np.uint8).reshape(rows.shape + self.shape[1:])
+        return shift_code[(slice(None),) * rows.ndim + rest] if rest else shift_code
+
+
+class FitnessCache:
+    def __init__(self, capacity: int) -> None:
+        """Cache cost jadwal dengan eviction LRU (least recently used). Key adalah
+        hash blake2b 128 bit dari kode shift compact (uint8) jadwal, sehingga jadwal
+        kontinu yang dibulatkan ke kode shift yang sama berbagi satu entry.
+
+        Args:
+            capacity (int): Jumlah maksimum jadwal yang disimpan
+        """
+        self.capacity = capacity
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def key(shift_code: np.ndarray) -> bytes:
+        """Fungsi untuk membuat key cache dari kode shift satu jadwal"""
+        return hashlib.blake2b(
+            np.ascontiguousarray(shift_code).data, digest_size=16
+        ).digest()
+
+    def get(self, key: bytes, accept=None):
+        """Fungsi untuk mengambil entry (None jika tidak ada), entry yang diambil
+        menjadi entry paling baru
+
+        Args:
+            key (bytes): Key cache
+            accept: Fungsi entry -> bool, entry yang tidak diterima dianggap miss
+        """
+        entry = self.entries.get(key)
+        if entry is None or (accept is not None and not accept(entry)):
+            self.misses += 1
+            return None
+        self.hits += 1
+        self.entries.move_to_end(key)
+        return entry
+
+    def put(self, key: bytes, entry) -> None:
+        """Fungsi untuk menyimpan entry, entry paling lama dibuang jika cache penuh"""
+        self.entries[key] = entry
+        self.entries.move_to_end(key)
+        if len(self.entries) > self.capacity:
+            self.entries.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self) -> None:
+        """Fungsi untuk menghapus seluruh entry (statistik tetap disimpan)"""
+        self.entries.clear()
+
+    def stats(self) -> dict:
+        """Fungsi untuk membuat ringkasan statistik cache
+
+        Returns:
+            stats: Dictionary berisi size, capacity, hits, misses, hit_rate, evictions
+        """
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self.entries),
+            "capacity": self.capacity,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+        }
+
+
+def _add_time(profile: dict, name: str, start: float) -> float:
+    """Fungsi untuk menambahkan waktu sejak start ke profile[name]
+
+    Returns:
+        now: Waktu sekarang (perf_counter), dipakai sebagai start tahap berikutnya
+    """
+    now = time.perf_counter()
+    profile[name] = profile.get(name, 0.0) + now - start
+    return now
+
+
+def _pattern_match(shift_code, shift) -> np.ndarray:
+    """Fungsi untuk mencocokkan kode shift dengan satu posisi pola transisi
+
+    Args:
+        shift_code (np.ndarray): Kode shift
+        shift: Kode shift (int) atau beberapa kode shift (tuple) pada posisi pola
+
+    Returns:
+        match: True jika kode shift sesuai posisi pola
+    """
+    if np.ndim(shift) == 0:
+        return shift_code == shift
+    return np.isin(shift_code, shift)
+
+
+def _generate_schedule(NSP, seed) -> np.ndarray:
+    """Fungsi worker untuk membangkitkan satu jadwal awal dengan seed tersendiri
+    (dipakai oleh NSP_Class.generate_population pada proses terpisah)
+    """
+    return NSP.generate_schedule(np.random.default_rng(seed))
+
+
+def _island_epoch(island, iterations: int):
+    """Fungsi worker untuk menjalankan satu epoch (sejumlah iterasi) WWO pada satu
+    pulau, stream RNG pulau ikut tersimpan di island.rng (dipakai oleh IslandWWO)
+    """
+    if not hasattr(island, "population"):
+        island.initialize()
+    for _ in range(iterations):
+        if island.stopping_criteria():
+            break
+        island.step()
+    island.stopping_criteria()
+    return island
+
+
+def _put_progress(queue, units_name: str, snapshot: dict) -> None:
+    """Fungsi progress worker optimize_units: snapshot dikirim ke proses utama
+    lewat queue
+    """
+    queue.put((units_name, snapshot))
+
+
+def _optimize_unit(unit_config: dict, params: dict, seed, progress=None) -> dict:
+    """Fungsi worker untuk membangun NSP_Class dan WWO satu unit lalu menjalankan
+    optimasi (dipakai oleh optimize_units pada proses terpisah). Jika progress
+    diberikan, progress(units_name, snapshot) dipanggil setiap iterasi.
+    """
+    NSP = NSP_Class(**unit_config, seed=seed)
+    wwo = WWO(NSP, **params)
+    if progress is None:
+        best_pos, best_fit = wwo.optimize()
+    else:
+        for snapshot in wwo.iterate():
+            progress(NSP.units_name, snapshot)
+        best_pos, best_fit = wwo.shift_label(wwo.best_pos), wwo.best_fit
+    return {
+        "units_name": NSP.units_name,
+        "first_schedule": NSP.nurse_array_col,
+        "best_pos": best_pos,
+        "best_fit": best_fit,
+        "best_fit_iteration": wwo.best_fit_iteration,
+        "stop_reason": wwo.stop_reason,
+        "eval_count": wwo.eval_count,
+        "elapsed_time": wwo.elapsed_time(),
+    }
+
 
 class NSP_Class:
     hard_penalti = 5
     soft_penalti = 1
+    # Batas generator "repair", jika tercapai pada unit feasible dipakai generator
+    # konstruktif, pada unit tidak feasible (on_infeasible="best_effort") dipakai
+    # jadwal terbaik yang ditemukan
+    repair_max_iteration = 1000
+    repair_time_limit = 10.0
+    # Urutan kolom breakdown cost pada cost_batch
+    constraint_names = (
+        "hard_constraint_cost_minimum_shift",
+        "hard_constraint_cost_one_per_day",
+        "hard_constraint_cost_night_day",
+        "hard_constraint_cost_two_night_holiday",
+        "soft_constraint_cost_noon_shift",
+        "soft_constraint_cost_morning_shift",
+        "soft_constraint_cost_night_holiday_noon",
+    )
+    # Tabel aturan transisi antar hari berurutan (0 pagi, 1 sore, 2 malam, 3 libur):
+    # (nama constraint, pola shift, penalti tiap kemunculan, hard constraint).
+    # Posisi pola dapat berisi beberapa shift sekaligus (tuple)
+    transition_rules = (
+        ("hard_constraint_cost_night_day", (2, 0), 1, True),
+        # HC 4: dua malam berturut-turut harus diikuti libur
+        ("hard_constraint_cost_two_night_holiday", (2, 2, (0, 1, 2)), 1, True),
+        ("soft_constraint_cost_noon_shift", (1, 0), 1, False),
+        ("soft_constraint_cost_morning_shift", (0, 2), 1, False),
+        ("soft_constraint_cost_night_holiday_noon", (2, 3, 1), -1, False),
+    )
+    # Tabel aturan jendela hari berurutan (sliding window) tiap perawat:
+    # (nama constraint, shift yang dihitung, lebar jendela, batas jumlah,
+    # penalti tiap kelebihan, hard constraint), lihat max_consecutive_work_rule dan
+    # min_days_off_rule
+    window_rules = ()
+
     def __init__(
         self,
         day: int,
@@ -12,6 +419,14 @@ class NSP_Class:
         unit_minimum_shift: np.ndarray,
         hard_constraint_multiplier: int,
         soft_constraint_multiplier: int,
+        cost_backend: str = "numpy",
+        transition_rules: tuple = None,
+        generator: str = "repair",
+        on_infeasible: str = "raise",
+        seed=None,
+        cache_size: int = None,
+        window_rules: tuple = None,
+        previous_schedule: np.ndarray = None,
     ) -> None:
         """Class Nurse Scheduling Problem yang berfungsi sebagai kontainer penyimpanan
         data-data yang dibutuhkan untuk menjalankan algoritma WWO. Class ini juga berfungsi
@@ -23,18 +438,493 @@ class NSP_Class:
             unit_total_nurse (int): Jumlah Perawat yang ada di unit
             unit_minimum_shift (np.ndarray): Jumlah minimum perawat tiap shift (1 x 3)
             hard_constraint_multiplier (int): Koefisien pengali hard constraint
+            cost_backend (str): Backend perhitungan cost, "numpy" atau "numba"
+            transition_rules (tuple): Tabel aturan transisi, default transition_rules
+            generator (str): Pembangkit jadwal awal, "repair" (acak lalu diperbaiki,
+                generate_initial_first_schedule) atau "constructive"
+                (generate_constructive_schedule)
+            on_infeasible (str): Jika parameter unit tidak mungkin dipenuhi
+                (check_feasibility), "raise" menolak dengan ValueError berisi laporan,
+                "best_effort" tetap membangkitkan jadwal dengan batas iterasi/waktu
+            seed: Seed (int, SeedSequence, atau np.random.Generator) untuk RNG jadwal
+                awal, rng ini juga dipakai WWO jika WWO tidak diberi seed sendiri
+            cache_size (int): Kapasitas cache cost jadwal (FitnessCache), None atau 0
+                = tanpa cache
+            window_rules (tuple): Tabel aturan jendela, default window_rules (kosong)
+            previous_schedule (np.ndarray): Jadwal bulan sebelumnya (Perawat x Hari,
+                label atau kode shift). Hari-hari terakhirnya menjadi batas (boundary)
+                sehingga aturan transisi dan jendela yang melewati pergantian bulan
+                ikut dihitung (lihat set_previous_schedule)
         """
+        if generator not in ("repair", "constructive"):
+            raise ValueError(f"Generator jadwal tidak dikenal: {generator}")
+        if on_infeasible not in ("raise", "best_effort"):
+            raise ValueError(f"Pilihan on_infeasible tidak dikenal: {on_infeasible}")
         self.day = day
         self.units_name = units_name
         self.unit_total_nurse = unit_total_nurse
         self.unit_minimum_shift = unit_minimum_shift
         self.hard_constraint_multiplier = hard_constraint_multiplier
         self.soft_constraint_multiplier = soft_constraint_multiplier
+        self.generator = generator
+        self.rng = np.random.default_rng(seed)
+        self.cost_cache = FitnessCache(cache_size) if cache_size else None
+        self._cache_multiplier = None
+        self.previous_schedule = previous_schedule
+        self.set_cost_backend(cost_backend)
+        self.build_transition_table(
+            self.transition_rules if transition_rules is None else transition_rules
+        )
+        self.build_window_table(
+            self.window_rules if window_rules is None else window_rules
+        )
 
-        self.nurse_first_schedule = self.generate_initial_first_schedule()
+        self.feasibility = self.check_feasibility()
+        if not self.feasibility["feasible"] and on_infeasible == "raise":
+            raise ValueError(
+                f"Unit {units_name} tidak dapat dijadwalkan: "
+                + "; ".join(self.feasibility["problems"])
+            )
+
+        self.nurse_first_schedule = self.generate_schedule()
         self.nurse_second_schedule = self.nurse_first_schedule
+        # Label jadwal awal ditetapkan sekali, generator tidak mengubah state NSP
+        self.nurse_array_col = shift_label(
+            self.nurse_first_schedule.reshape(self.unit_total_nurse, self.day)
+        )
+
+    def set_cost_backend(self, cost_backend: str) -> None:
+        """Fungsi untuk memilih backend perhitungan cost
+
+        Args:
+            cost_backend (str): "numpy" (default) atau "numba" (kernel terkompilasi)
+        """
+        if cost_backend not in ("numpy", "numba"):
+            raise ValueError(f"Backend cost tidak dikenal: {cost_backend}")
+        if cost_backend == "numba" and njit is None:
+            raise ImportError("Backend cost numba membutuhkan package numba")
+        self.cost_backend = cost_backend
+        self.clear_cache()
+
+    def build_transition_table(self, transition_rules: tuple) -> None:
+        """Fungsi untuk membangun tabel penalti transisi. Setiap pola shift berurutan
+        dengan panjang L dikodekan sebagai bilangan basis 5 (kode 4 = bukan shift)
+        ditambah offset untuk panjang L, sehingga semua pola dapat dihitung dengan
+        satu kali bincount. Posisi pola yang berisi beberapa shift (tuple) dijabarkan
+        menjadi seluruh kombinasi kodenya.
+
+        Args:
+            transition_rules (tuple): (nama constraint, pola shift, penalti, hard)
+        """
+        transition_rules = tuple(transition_rules)
+        lengths = sorted({len(pattern) for _, pattern, _, _ in transition_rules})
+        # Pola yang lebih panjang dari jumlah hari tidak pernah muncul (cost 0)
+        if lengths and lengths[0] < 2:
+            raise ValueError("Panjang pola transisi minimal 2")
+        offsets = np.cumsum([0] + [5 ** length for length in lengths])
+
+        penalty_dtype = np.result_type(
+            *[np.asarray(penalty) for _, _, penalty, _ in transition_rules], np.int64
+        )
+        transition_penalty = np.zeros(
+            (offsets[-1], len(transition_rules)), dtype=penalty_dtype
+        )
+        for rule, (_, pattern, penalty, _) in enumerate(transition_rules):
+            offset = offsets[lengths.index(len(pattern))]
+            for shifts in product(*[np.atleast_1d(shift).tolist() for shift in pattern]):
+                code = offset
+                for position, shift in enumerate(shifts):
+                    code += shift * 5 ** (len(pattern) - 1 - position)
+                transition_penalty[code, rule] += penalty
+
+        self.transition_rules = transition_rules
+        self.transition_lengths = np.array(lengths, dtype=np.int64)
+        self.transition_offsets = offsets[:-1].astype(np.int64)
+        self.transition_penalty = transition_penalty
+        self._transition_penalty_kernel = transition_penalty.astype(np.float64)
+        self.clear_cache()
+        self.build_window_table(self.window_rules)
+
+    def build_window_table(self, window_rules: tuple) -> None:
+        """Fungsi untuk membangun tabel aturan jendela. Kolom breakdown aturan jendela
+        diletakkan setelah kolom aturan transisi.
+
+        Args:
+            window_rules (tuple): (nama constraint, shift yang dihitung, lebar jendela,
+                batas jumlah, penalti, hard)
+        """
+        window_rules = tuple(window_rules)
+        for name, _, window, limit, penalty, _ in window_rules:
+            if not 1 <= window <= self.day or limit < 0:
+                raise ValueError(f"Lebar/batas aturan jendela tidak valid: {name}")
+            if penalty < 0:
+                raise ValueError(f"Penalti aturan jendela tidak boleh negatif: {name}")
+        # Mask shift yang dihitung tiap aturan (Aturan x 5)
+        window_shift = np.zeros((len(window_rules), 5), dtype=bool)
+        for rule, (_, shifts, _, _, _, _) in enumerate(window_rules):
+            window_shift[rule, list(np.atleast_1d(shifts))] = True
+
+        self.window_rules = window_rules
+        self.window_shift = window_shift
+        self.window_column = 2 + len(self.transition_rules)
+        # Jangkauan terjauh (hari) seluruh aturan transisi dan jendela
+        self.rule_span = max(
+            [int(self.transition_lengths.max(initial=1))]
+            + [window for _, _, window, _, _, _ in window_rules]
+        )
+        self.constraint_names = NSP_Class.constraint_names[:2] + tuple(
+            name for name, _, _, _ in self.transition_rules
+        ) + tuple(name for name, _, _, _, _, _ in window_rules)
+        self.hard_constraint_mask = np.array(
+            [True, True]
+            + [hard for _, _, _, hard in self.transition_rules]
+            + [hard for _, _, _, _, _, hard in window_rules]
+        )
+        self.clear_cache()
+        self.set_previous_schedule(self.previous_schedule)
+
+    def set_previous_schedule(self, previous_schedule) -> None:
+        """Fungsi untuk memasang jadwal bulan sebelumnya sebagai batas (boundary):
+        rule_span - 1 hari terakhirnya diletakkan sebelum hari pertama setiap jadwal
+        saat menghitung aturan transisi dan jendela. Pola/jendela yang seluruhnya
+        berada di hari batas tidak dihitung (dikurangi boundary_cost), minimum shift
+        hanya dihitung untuk bulan ini. Perawat yang tidak ada di jadwal bulan
+        sebelumnya diberi kode 4 (bukan shift).
+
+        Args:
+            previous_schedule (np.ndarray): Jadwal bulan sebelumnya (Perawat x Hari),
+                None = tanpa batas
+        """
+        boundary_days = self.rule_span - 1
+        self.previous_schedule = previous_schedule
+        boundary = np.full((self.unit_total_nurse, boundary_days), 4, dtype=np.uint8)
+        if previous_schedule is not None and boundary_days:
+            previous = from_shift_label(previous_schedule)
+            if previous.ndim == 1:
+                previous = previous.reshape(self.unit_total_nurse, -1)
+            previous = previous[:, -boundary_days:]
+            total_nurse = min(len(previous), self.unit_total_nurse)
+            boundary[:total_nurse, boundary_days - previous.shape[1] :] = previous[
+                :total_nurse
+            ]
+        if previous_schedule is None:
+            boundary = boundary[:, :0]
+        self.boundary = boundary
+
+        # Cost pola dan jendela yang seluruhnya berada di hari batas
+        boundary_cost = []
+        for _, pattern, penalty, _ in self.transition_rules:
+            width = boundary.shape[1] - len(pattern) + 1
+            if width <= 0:
+                boundary_cost.append(0)
+                continue
+            match = _pattern_match(boundary[:, :width], pattern[0])
+            for position in range(1, len(pattern)):
+                match &= _pattern_match(
+                    boundary[:, position : position + width], pattern[position]
+                )
+            boundary_cost.append(penalty * np.count_nonzero(match))
+        boundary_cost.extend(self.window_cost_batch(boundary[None])[0])
+        self.boundary_cost = np.array(boundary_cost)
+        # Jumlah tiap kode shift di hari batas (untuk batas bawah bounded_cost_batch)
+        self.boundary_shift_total = np.bincount(boundary.ravel(), minlength=5)
+        self.clear_cache()
+
+    def extend_boundary(self, shift_code) -> np.ndarray:
+        """Fungsi untuk meletakkan hari batas bulan sebelumnya di depan jadwal
+
+        Args:
+            shift_code (np.ndarray): Kode shift (Populasi x Perawat x Hari)
+
+        Returns:
+            shift_code: Kode shift (Populasi x Perawat x Batas+Hari), array yang sama
+                jika tidak ada batas
+        """
+        if not self.boundary.shape[1]:
+            return shift_code
+        boundary = np.broadcast_to(self.boundary, (len(shift_code),) + self.boundary.shape)
+        return np.concatenate((boundary, shift_code), axis=2)
 
-    def generate_initial_first_schedule(self) -> np.ndarray:
+    @staticmethod
+    def max_consecutive_work_rule(days: int, penalty=1, hard: bool = True) -> tuple:
+        """Fungsi untuk membuat aturan jendela maksimum hari kerja berturut-turut:
+        setiap jendela days + 1 hari yang seluruhnya bekerja (pagi, sore, atau malam)
+        diberi penalti
+
+        Returns:
+            window_rule: Aturan jendela untuk window_rules
+        """
+        prefix = "hard" if hard else "soft"
+        return (
+            f"{prefix}_constraint_cost_max_consecutive_work",
+            (0, 1, 2),
+            days + 1,
+            days,
+            penalty,
+            hard,
+        )
+
+    @staticmethod
+    def min_days_off_rule(
+        days_off: int, window: int = 7, penalty=1, hard: bool = True
+    ) -> tuple:
+        """Fungsi untuk membuat aturan jendela minimum hari libur: setiap jendela
+        window hari berisi paling banyak window - days_off hari kerja, tiap hari
+        kerja yang berlebih diberi penalti
+
+        Returns:
+            window_rule: Aturan jendela untuk window_rules
+        """
+        prefix = "hard" if hard else "soft"
+        return (
+            f"{prefix}_constraint_cost_min_days_off",
+            (0, 1, 2),
+            window,
+            window - days_off,
+            penalty,
+            hard,
+        )
+
+    def window_cost_batch(self, shift_code, rules=None) -> np.ndarray:
+        """Fungsi untuk menghitung cost aturan jendela tiap jadwal. Jumlah shift
+        tiap jendela dihitung dari selisih cumulative sum sepanjang hari.
+
+        Args:
+            shift_code (np.ndarray): Kode shift (Populasi x Perawat x Hari)
+            rules: Index aturan jendela yang dihitung (None = seluruh aturan)
+
+        Returns:
+            cost_window: Cost tiap aturan jendela (Populasi x Aturan)
+        """
+        rules = range(len(self.window_rules)) if rules is None else rules
+        total_population, total_nurse, day = shift_code.shape
+        cost_window = np.zeros(
+            (total_population, len(rules)),
+            dtype=np.result_type(
+                np.int64, *[self.window_rules[rule][4] for rule in rules]
+            ),
+        )
+        cumulative = np.zeros((total_population, total_nurse, day + 1), dtype=np.int32)
+        for column, rule in enumerate(rules):
+            _, _, window, limit, penalty, _ = self.window_rules[rule]
+            np.cumsum(self.window_shift[rule][shift_code], axis=2, out=cumulative[..., 1:])
+            count = cumulative[..., window:] - cumulative[..., :-window]
+            cost_window[:, column] = penalty * np.sum(
+                (count - limit).clip(min=0), axis=(1, 2)
+            )
+        return cost_window
+
+    def transition_histogram(self, shift_code) -> np.ndarray:
+        """Fungsi untuk menghitung histogram kode pola transisi tiap jadwal
+        dengan satu kali bincount
+
+        Args:
+            shift_code (np.ndarray): Kode shift (Populasi x Perawat x Hari)
+
+        Returns:
+            histogram: Jumlah kemunculan tiap kode pola (Populasi x Kode)
+        """
+        total_population, _, day = shift_code.shape
+        total_code = self.transition_penalty.shape[0]
+        shift_code = shift_code.astype(np.intp)
+        population_offset = (np.arange(total_population) * total_code)[:, None, None]
+
+        codes = [np.zeros(0, dtype=np.intp)]
+        for length, offset in zip(self.transition_lengths, self.transition_offsets):
+            width = day - length + 1
+            if width <= 0:
+                # Pola lebih panjang dari jumlah hari
+                continue
+            code = shift_code[:, :, :width].copy()
+            for position in range(1, length):
+                code *= 5
+                code += shift_code[:, :, position : width + position]
+            code += population_offset + offset
+            codes.append(code.ravel())
+        histogram = np.bincount(
+            np.concatenate(codes), minlength=total_population * total_code
+        )
+        return histogram.reshape(total_population, total_code)
+
+    def total_cost(self, breakdown) -> np.ndarray:
+        """Fungsi untuk menghitung total cost dari breakdown cost tiap constraint
+
+        Args:
+            breakdown (np.ndarray): Cost tiap constraint (... x Constraint)
+
+        Returns:
+            cost: Total cost
+        """
+        return self.hard_constraint_multiplier * np.sum(
+            breakdown[..., self.hard_constraint_mask], axis=-1
+        ) + np.sum(breakdown[..., ~self.hard_constraint_mask], axis=-1)
+
+    def generate_schedule(self, rng: np.random.Generator = None) -> np.ndarray:
+        """Fungsi untuk membangkitkan jadwal awal dengan generator yang dipilih.
+        Generator "repair" dibatasi repair_max_iteration dan repair_time_limit, jika
+        batas tercapai pada unit yang feasible dipakai generator konstruktif sehingga
+        waktu pembangkitan selalu terbatas.
+
+        Args:
+            rng (np.random.Generator): RNG yang dipakai (None = self.rng)
+
+        Returns:
+            nurse_array : Jadwal awal perawat (uint8) (Jumlah Perawat*Hari)
+        """
+        if self.generator == "constructive":
+            return self.generate_constructive_schedule(rng)
+        # Perbaikan selalu dibatasi iterasi/waktu, perbaikan acak dapat tidak pernah
+        # mencapai 0 meskipun unit lolos check_feasibility
+        nurse_array = self.generate_initial_first_schedule(
+            max_iteration=self.repair_max_iteration,
+            time_limit=self.repair_time_limit,
+            rng=rng,
+        )
+        if self.feasibility["feasible"]:
+            cost_minimum_shift, _ = self.minimum_shift_cost_batch(
+                nurse_array.reshape(1, self.unit_total_nurse, self.day)
+            )
+            if cost_minimum_shift[0]:
+                # Batas tercapai pada unit feasible, dipakai generator konstruktif
+                return self.generate_constructive_schedule(rng)
+        return nurse_array
+
+    def check_feasibility(self) -> dict:
+        """Fungsi untuk mengecek apakah kebutuhan minimum shift unit mungkin dipenuhi
+        sebelum jadwal dibangkitkan.
+        1. Kapasitas per hari: pagi + sore + malam <= jumlah perawat
+        2. Istirahat malam (Hard Constraint 3): perawat malam hari ini tidak dapat
+           pagi besok, sehingga pagi + malam <= jumlah perawat
+        3. Aturan jendela hard: tiap perawat paling banyak mendapat batas shift
+           yang dihitung per jendela, sehingga kebutuhan minimum shift tersebut
+           selama satu jendela <= batas * jumlah perawat
+        4. Dua malam lalu libur (Hard Constraint 4): perawat malam hari ini besok
+           mendapat sore, libur, atau malam lagi (lalu libur lusa), sehingga
+           malam <= sore + 2 * (jumlah perawat - pagi - sore - malam)
+
+        Pengecekan ini hanya syarat perlu. HC4 tidak dicek lebih jauh dari poin 4
+        (mis. interaksinya dengan aturan jendela atau hari batas bulan sebelumnya),
+        sehingga unit yang lolos belum tentu dapat dijadwalkan tanpa pelanggaran.
+
+        Returns:
+            report: Dictionary berisi feasible, problems (daftar masalah), dan
+                hard_cost_lower_bound (batas bawah cost minimum shift + malam ke pagi)
+        """
+        morning, noon, night = np.asarray(self.unit_minimum_shift)[:3].tolist()
+        total_nurse = int(self.unit_total_nurse)
+        problems = []
+        if min(morning, noon, night) < 0:
+            problems.append("Minimum shift tidak boleh negatif")
+
+        required_per_day = morning + noon + night
+        if required_per_day > total_nurse:
+            problems.append(
+                f"Kapasitas per hari: pagi + sore + malam = {required_per_day} "
+                f"> {total_nurse} perawat"
+            )
+        required_night_rest = morning + night
+        if self.day > 1 and required_night_rest > total_nurse:
+            problems.append(
+                f"Istirahat malam: pagi + malam hari sebelumnya = {required_night_rest} "
+                f"> {total_nurse} perawat"
+            )
+
+        hard_cost_lower_bound = max(
+            self.day * max(required_per_day - total_nurse, 0),
+            (self.day - 1) * max(required_night_rest - total_nurse, 0),
+        )
+        slack = total_nurse - required_per_day
+        for name, pattern, penalty, hard in self.transition_rules:
+            if name != "hard_constraint_cost_two_night_holiday" or not hard:
+                continue
+            # Tiap blok len(pattern) hari yang tidak beririsan, kelebihan malam harus
+            # dibayar dengan pelanggaran HC4 atau constraint hard lain
+            excess_night = night - noon - 2 * max(slack, 0)
+            if self.day >= len(pattern) and excess_night > 0:
+                problems.append(
+                    f"Dua malam lalu libur: malam = {night} > sore + 2 x sisa perawat "
+                    f"= {noon + 2 * max(slack, 0)}"
+                )
+                hard_cost_lower_bound = max(
+                    hard_cost_lower_bound,
+                    (self.day // len(pattern)) * excess_night * min(penalty, 1),
+                )
+        for rule, (name, _, window, limit, penalty, hard) in enumerate(
+            self.window_rules
+        ):
+            required_window = window * sum(
+                (morning, noon, night)[shift]
+                for shift in np.flatnonzero(self.window_shift[rule][:3])
+            )
+            if hard and required_window > limit * total_nurse:
+                problems.append(
+                    f"Aturan jendela {name}: kebutuhan {required_window} shift per "
+                    f"{window} hari > {limit} x {total_nurse} perawat"
+                )
+                # Tiap jendela yang tidak beririsan kekurangan kapasitas yang sama,
+                # dibayar dengan kekurangan minimum shift atau penalti aturan jendela
+                hard_cost_lower_bound = max(
+                    hard_cost_lower_bound,
+                    (self.day // window)
+                    * (required_window - limit * total_nurse)
+                    * min(penalty, 1),
+                )
+        return {
+            "feasible": not problems,
+            "problems": problems,
+            "total_nurse": total_nurse,
+            "required_per_day": required_per_day,
+            "required_night_rest": required_night_rest,
+            "hard_cost_lower_bound": hard_cost_lower_bound,
+        }
+
+    def generate_constructive_schedule(self, rng: np.random.Generator = None) -> np.ndarray:
+        """Fungsi untuk membangkitkan jadwal awal secara konstruktif. Tiap hari,
+        perawat diacak lalu diberi tepat jumlah minimum shift pagi, sore, dan malam,
+        sisanya libur. Perawat yang malam di hari sebelumnya diletakkan di urutan
+        akhir untuk shift pagi sehingga tidak terjadi malam -> pagi (Hard Constraint 3)
+        selama pagi + malam <= jumlah perawat, dan perawat yang malam dua hari
+        berturut-turut diletakkan paling akhir untuk seluruh shift sehingga
+        mendapat libur (Hard Constraint 4) selama masih ada perawat lain. Waktu
+        eksekusi tetap (satu iterasi numpy per hari) untuk ukuran unit berapapun.
+
+        Args:
+            rng (np.random.Generator): RNG yang dipakai (None = self.rng)
+
+        Returns:
+            nurse_array : Jadwal awal perawat (uint8) (Jumlah Perawat*Hari)
+        """
+        rng = self.rng if rng is None else rng
+        morning, noon, night = (
+            np.asarray(self.unit_minimum_shift)[:3].astype(int).clip(min=0)
+        )
+        nurse_array_col = np.full((self.unit_total_nurse, self.day), 3, dtype=np.uint8)
+        # Malam di akhir bulan sebelumnya (hari batas) ikut diperhitungkan
+        boundary = np.full((self.unit_total_nurse, 2), 4, dtype=np.uint8)
+        boundary[:, 2 - min(self.boundary.shape[1], 2) :] = self.boundary[:, -2:]
+        night_before = boundary[:, 1] == 2
+        two_night = night_before & (boundary[:, 0] == 2)
+        for day in range(self.day):
+            order = rng.permutation(self.unit_total_nurse)
+            order = order[
+                np.argsort(night_before[order] + two_night[order], kind="stable")
+            ]
+            rest = rng.permutation(order[morning:])
+            rest = rest[np.argsort(two_night[rest], kind="stable")]
+            nurse_array_col[order[:morning], day] = 0
+            nurse_array_col[rest[:noon], day] = 1
+            nurse_array_col[rest[noon : noon + night], day] = 2
+            two_night = night_before & (nurse_array_col[:, day] == 2)
+            night_before = nurse_array_col[:, day] == 2
+
+        return nurse_array_col.flatten()
+
+    def generate_initial_first_schedule(
+        self,
+        max_iteration: int = None,
+        time_limit: float = None,
+        rng: np.random.Generator = None,
+    ) -> np.ndarray:
         """Fungsi untuk menginisialisasi array awal jadwal 1
         yang akan dioptimalisasi menggunakan WWO
 
@@ -48,11 +938,19 @@ class NSP_Class:
         hari berturut-turut dalam satu minggu maka perawat
         tersebut mendapatkan libur pada hari berikutnya.
 
+        Args:
+            max_iteration (int): Batas iterasi perbaikan (None = tanpa batas)
+            time_limit (float): Batas waktu perbaikan dalam detik (None = tanpa batas).
+                Jika batas tercapai, dikembalikan jadwal dengan kekurangan minimum
+                shift terkecil yang ditemukan
+            rng (np.random.Generator): RNG yang dipakai (None = self.rng)
+
         Returns:
             nurse_array : Jadwal awal perawat (kode Int 0 1 2 3) (Jumlah Perawat x Hari)
         """
+        rng = self.rng if rng is None else rng
         # Memastikan sesuai Hard Constraint 2
-        nurse_array_HC2 = np.random.randint(4, size=(self.unit_total_nurse * self.day))
+        nurse_array_HC2 = rng.integers(4, size=(self.unit_total_nurse * self.day))
 
         # Memastikan sesuai Hard Constraint 134
         nurse_array_col = np.reshape(nurse_array_HC2, (-1, self.day))
@@ -76,8 +974,22 @@ class NSP_Class:
             np.where(array_difference[:, :3] < 0, array_difference[:, :3], 0)
         )
 
+        # Batas iterasi/waktu perbaikan (best-effort), jadwal terbaik yang disimpan
+        repair_iteration = 0
+        start_time = time.perf_counter()
+        best_nurse_array_col, best_check = nurse_array_col.copy(), check_if_not_minimal
+
         # Memastikan sesuai dengan HC sembari memastikan sesuai dengan HC 3 dan 4
         while check_if_not_minimal != 0:
+            if check_if_not_minimal > best_check:
+                best_nurse_array_col = nurse_array_col.copy()
+                best_check = check_if_not_minimal
+            if (max_iteration is not None and repair_iteration >= max_iteration) or (
+                time_limit is not None and time.perf_counter() - start_time >= time_limit
+            ):
+                nurse_array_col = best_nurse_array_col
+                break
+            repair_iteration += 1
 
             # Mencari shift dengan perbedaan negatif dan positif
             array_check_n = -np.where(array_difference < 0, array_difference, 0)
@@ -163,22 +1075,25 @@ class NSP_Class:
                             total_negative -= 1
 
             where_night = np.argwhere(nurse_array_col == 2)
+            # Bilangan acak untuk seluruh shift malam diambil sekaligus
+            night_choice = rng.integers(low=0, high=1, size=len(where_night))
+            night_next_shift = rng.integers(low=1, high=4, size=len(where_night))
+            night_shift = rng.integers(low=0, high=4, size=len(where_night))
 
-            for night_pos in where_night:
+            for night_index, night_pos in enumerate(where_night):
                 # HC 3
                 # Cek jika tidak di hari terakhir
                 if night_pos[1] + 1 < nurse_array_col.shape[1]:
                     if nurse_array_col[night_pos[0], night_pos[1] + 1] == 0:
                         # Jika besoknya pagi, maka antara diganti menjadi antara sore,malam,dan libur atau random
-                        rng = np.random.randint(low=0, high=1, size=1)[0]
-                        if rng == 0:
+                        if night_choice[night_index] == 0:
                             nurse_array_col[
                                 night_pos[0], night_pos[1] + 1
-                            ] = np.random.randint(low=1, high=4, size=1)[0]
+                            ] = night_next_shift[night_index]
                         else:
                             nurse_array_col[
                                 night_pos[0], night_pos[1]
-                            ] = np.random.randint(low=0, high=4, size=1)[0]
+                            ] = night_shift[night_index]
                 # HC 4
                 # if night_pos[1] + 2 < nurse_array_col.shape[1]:
                 #     if nurse_array_col[night_pos[0], night_pos[1] + 1] == 2:
@@ -214,7 +1129,7 @@ class NSP_Class:
             )
             if check_if_not_minimal == check_if_not_minimal2:
                 # Memastikan sesuai Hard Constraint 2
-                nurse_array_HC2 = np.random.randint(
+                nurse_array_HC2 = rng.integers(
                     4, size=(self.unit_total_nurse * self.day)
                 )
 
@@ -242,48 +1157,255 @@ class NSP_Class:
                 )
             else:
                 check_if_not_minimal = check_if_not_minimal2
-        self.nurse_array_col = nurse_array_col
-        self.nurse_array_col = np.where(self.nurse_array_col.astype(str)=="0","Pagi",self.nurse_array_col.astype(str))
-        self.nurse_array_col = np.where(self.nurse_array_col.astype(str)=="1","Sore",self.nurse_array_col.astype(str))
-        self.nurse_array_col = np.where(self.nurse_array_col.astype(str)=="2","Malam",self.nurse_array_col.astype(str))
-        self.nurse_array_col = np.where(self.nurse_array_col.astype(str)=="3","Libur",self.nurse_array_col.astype(str))
         # nurse_array = (
         #     (nurse_array_col.flatten()[:, None] == np.arange(4)) * 1
         # ).flatten()
         
-        nurse_array = nurse_array_col.flatten()
+        # Jadwal disimpan dalam bentuk compact (uint8)
+        nurse_array = to_shift_code(nurse_array_col.flatten())
         return nurse_array
 
-    def cost(self, nurse_array) -> float:
-        """Fungsi untuk menghitung total cost dari model NSP
+    def generate_population(
+        self, size: int, workers: int = None, rng: np.random.Generator = None
+    ) -> np.ndarray:
+        """Fungsi untuk membangkitkan sejumlah jadwal awal yang saling independen
+
+        Args:
+            size (int): Jumlah jadwal
+            workers (int): Jumlah proses paralel (None = serial di proses ini)
+            rng (np.random.Generator): RNG asal seed tiap jadwal (None = self.rng)
 
         Returns:
-            cost: Nilai cost dari model NSP
+            population: Array jadwal (size x Perawat*Hari) (uint8)
         """
-        # nurse_array = nurse_array.reshape(self.unit_total_nurse, 4 * self.day)
-        # nurse_array = np.round(nurse_array)
-        
-        nurse_array = nurse_array.reshape(-1,self.day)
+        rng = self.rng if rng is None else rng
+        # Tiap jadwal mendapat stream RNG sendiri (SeedSequence.spawn), sehingga hasil
+        # serial dan paralel sama
+        seeds = np.random.SeedSequence(rng.integers(2 ** 32, size=4)).spawn(size)
+        if workers is None or workers <= 1 or size <= 1:
+            return np.stack([_generate_schedule(self, seed) for seed in seeds])
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            population = list(executor.map(_generate_schedule, [self] * size, seeds))
+        return np.stack(population)
+
+    def align_schedule(self, schedule, fill) -> np.ndarray:
+        """Fungsi untuk menyesuaikan jadwal lain (misal hasil bulan lalu atau jadwal
+        yang diedit manual) dengan ukuran unit: perawat berlebih dibuang, perawat
+        yang kurang diambil dari fill, dan jadwal diulang dari awal jika jumlah hari
+        lebih sedikit (dipotong jika lebih banyak)
 
-        cost_minimum_shift = self.hard_constraint_cost_minimum_shift(nurse_array)
-        cost_one_per_day = self.hard_constraint_cost_one_per_day(nurse_array)
-        cost_night_day = self.hard_constraint_cost_night_day(nurse_array)
+        Args:
+            schedule (np.ndarray): Jadwal (Perawat x Hari), label atau kode shift
+            fill (np.ndarray): Jadwal pengisi (Perawat x Hari unit)
 
-        cost_noon_shift = self.soft_constraint_cost_noon_shift(nurse_array)
-        cost_morning_shift = self.soft_constraint_cost_morning_shift(nurse_array)
-        cost_night_holiday_noon = self.soft_constraint_cost_night_holiday_noon(
-            nurse_array
-        )
+        Returns:
+            shift_code: Jadwal (Perawat x Hari unit) (uint8)
+        """
+        shift_code = from_shift_label(schedule)
+        if shift_code.ndim == 1:
+            shift_code = shift_code.reshape(self.unit_total_nurse, -1)
+        aligned = to_shift_code(fill).reshape(self.unit_total_nurse, self.day).copy()
+        total_nurse = min(len(shift_code), self.unit_total_nurse)
+        day = np.arange(self.day) % shift_code.shape[1]
+        aligned[:total_nurse] = shift_code[:total_nurse][:, day]
+        return aligned
+
+    def generate_warm_population(
+        self,
+        schedule,
+        size: int,
+        perturbation: float = 0.05,
+        rng: np.random.Generator = None,
+    ) -> np.ndarray:
+        """Fungsi untuk membangkitkan populasi awal dari sebuah jadwal (warm start).
+        Jadwal pertama adalah jadwal tersebut (disesuaikan dengan align_schedule,
+        perawat baru diisi dari jadwal awal NSP), jadwal lainnya diberi perturbasi
+        berupa pertukaran shift dua perawat acak pada hari yang sama sehingga jumlah
+        shift per hari (minimum shift) tetap.
 
-        cost = (
-            self.hard_constraint_multiplier
-            * (cost_minimum_shift + cost_one_per_day + cost_night_day)
-            + cost_noon_shift
-            + cost_morning_shift
-            + cost_night_holiday_noon
+        Args:
+            schedule (np.ndarray): Jadwal awal (Perawat x Hari), label atau kode shift
+            size (int): Jumlah jadwal
+            perturbation (float): Proporsi sel yang ditukar pada tiap jadwal selain
+                jadwal pertama
+            rng (np.random.Generator): RNG yang dipakai (None = self.rng)
+
+        Returns:
+            population: Array jadwal (size x Perawat*Hari) (uint8)
+        """
+        rng = self.rng if rng is None else rng
+        total_nurse, total_day = self.unit_total_nurse, self.day
+        warm = self.align_schedule(schedule, self.nurse_second_schedule)
+        population = np.repeat(warm.reshape(1, -1), size, axis=0)
+
+        # Setiap pertukaran mengubah dua sel, diterapkan ke seluruh jadwal sekaligus
+        total_swap = int(round(perturbation * total_nurse * total_day / 2))
+        if size < 2 or total_nurse < 2:
+            return population
+        waves = np.arange(1, size)
+        for _ in range(total_swap):
+            day = rng.integers(total_day, size=size - 1)
+            nurse_a = rng.integers(total_nurse, size=size - 1)
+            nurse_b = (nurse_a + rng.integers(1, total_nurse, size=size - 1)) % total_nurse
+            cell_a, cell_b = nurse_a * total_day + day, nurse_b * total_day + day
+            population[waves, cell_a], population[waves, cell_b] = (
+                population[waves, cell_b],
+                population[waves, cell_a],
+            )
+        return population
+
+    def repair_batch(
+        self, nurse_arrays, rng: np.random.Generator = None, out: np.ndarray = None
+    ) -> np.ndarray:
+        """Operator perbaikan hard constraint untuk beberapa jadwal sekaligus, versi
+        vektor dari perbaikan di generate_initial_first_schedule.
+        1. Malam -> pagi (Hard Constraint 3): shift pagi esok harinya diganti sore
+           atau libur secara acak. Malam dua hari berturut-turut (Hard Constraint 4):
+           shift lusa diganti libur
+        2. Minimum shift (Hard Constraint 1): tiap hari, kekurangan pagi, malam, lalu
+           sore diisi oleh perawat dari shift yang berlebih (termasuk libur dan sel
+           bukan kode shift), dipilih acak untuk seluruh jadwal sekaligus. Perawat
+           yang sel barunya membentuk malam -> pagi atau malam, malam -> kerja tidak
+           dipilih, sehingga langkah 2 tidak membuat pelanggaran baru
+        Hari batas bulan sebelumnya (previous_schedule) ikut diperhitungkan pada
+        kedua langkah. Hanya sel yang diubah yang ditulis, sel lain (termasuk nilai pecahan pada
+        mode continuous) tetap. Jika kebutuhan tidak mungkin dipenuhi, kekurangan
+        yang tersisa dibiarkan (best-effort).
+
+        Args:
+            nurse_arrays: Jadwal (Perawat*Hari) atau beberapa jadwal
+                (Jumlah jadwal x Perawat*Hari)
+            rng (np.random.Generator): RNG yang dipakai (None = self.rng)
+            out (np.ndarray): Array tujuan (boleh nurse_arrays sendiri), None = salinan
+
+        Returns:
+            nurse_arrays: Jadwal hasil perbaikan dengan dtype dan bentuk yang sama
+        """
+        rng = self.rng if rng is None else rng
+        nurse_arrays = np.asarray(nurse_arrays)
+        current = to_shift_code(nurse_arrays).reshape(
+            -1, self.unit_total_nurse, self.day
+        )
+        original = current.copy()
+        # Hari batas bulan sebelumnya (boundary) ikut diperiksa tetapi tidak diubah
+        boundary_days = self.boundary.shape[1]
+        shift_code = self.extend_boundary(current)
+        current = shift_code[:, :, boundary_days:]
+        total_nurse, total_day = shift_code.shape[1:]
+        minimum = np.zeros(5, dtype=int)
+        minimum[:3] = np.asarray(self.unit_minimum_shift)[:3]
+        minimum = minimum.clip(min=0)
+
+        # HC 3: malam -> pagi, pagi esok harinya diganti sore atau libur
+        next_day = shift_code[:, :, 1:]
+        night_morning = (shift_code[:, :, :-1] == 2) & (next_day == 0)
+        night_morning[:, :, : max(boundary_days - 1, 0)] = False
+        next_day[night_morning] = np.where(
+            rng.random(np.count_nonzero(night_morning)) < 0.5, 1, 3
+        )
+        # HC 4: malam dua hari berturut-turut, lusa diganti libur
+        two_night = shift_code[:, :, :-2] == 2
+        two_night &= shift_code[:, :, 1:-1] == 2
+        two_night &= shift_code[:, :, 2:] < 3
+        two_night[:, :, : max(boundary_days - 2, 0)] = False
+        shift_code[:, :, 2:][two_night] = 3
+
+        # HC 1: kekurangan minimum shift diisi dari shift yang berlebih. Pengisian
+        # hanya mengubah hari itu sendiri, sehingga jumlah shift seluruh hari cukup
+        # dihitung sekali dan hanya hari/jadwal yang kurang yang diproses
+        code_range = np.arange(5)
+        count_all = np.count_nonzero(current[..., None] == code_range, axis=1)
+        deficit_all = (minimum[:3] - count_all[..., :3]).clip(min=0)
+        for day in np.flatnonzero(deficit_all.any(axis=(0, 2))):
+            rows = np.flatnonzero(deficit_all[:, day].any(axis=1))
+            column = boundary_days + day
+            code = shift_code[rows, :, column]
+            count = count_all[rows, day]
+            schedule_index = np.arange(len(rows))[:, None]
+            priority = rng.random(code.shape)
+            # Perawat yang wajib libur (malam dua hari sebelumnya) dan perawat yang
+            # jika diberi malam membentuk malam, malam -> kerja
+            rest_day = np.zeros(code.shape, dtype=bool)
+            night_work = np.zeros(code.shape, dtype=bool)
+            if column > 1:
+                rest_day = shift_code[rows, :, column - 2] == 2
+                rest_day &= shift_code[rows, :, column - 1] == 2
+            if 0 < column < total_day - 1:
+                night_work |= (shift_code[rows, :, column - 1] == 2) & (
+                    shift_code[rows, :, column + 1] < 3
+                )
+            if column < total_day - 2:
+                night_work |= (shift_code[rows, :, column + 1] == 2) & (
+                    shift_code[rows, :, column + 2] < 3
+                )
+            for shift in (0, 2, 1):
+                deficit = (minimum[shift] - count[:, shift]).clip(min=0)
+                if not deficit.any():
+                    continue
+                allowed = code != shift
+                if shift == 0 and column > 0:
+                    allowed &= shift_code[rows, :, column - 1] != 2
+                if shift == 2 and column < total_day - 1:
+                    allowed &= shift_code[rows, :, column + 1] != 0
+                allowed &= ~rest_day
+                if shift == 2:
+                    allowed &= ~night_work
+                # Perawat diurutkan per shift asal lalu acak, tiap shift asal hanya
+                # menyumbang sebanyak kelebihannya
+                order = np.argsort(np.where(allowed, code + priority, np.inf), axis=1)
+                order_code = code[schedule_index, order].astype(np.intp)
+                allowed_count = np.count_nonzero(
+                    allowed[:, :, None] & (code[:, :, None] == code_range), axis=1
+                )
+                group_start = np.cumsum(allowed_count, axis=1) - allowed_count
+                rank = np.arange(total_nurse) - np.take_along_axis(
+                    group_start, order_code, axis=1
+                )
+                surplus = (count - minimum).clip(min=0)
+                donor = allowed[schedule_index, order] & (
+                    rank < np.take_along_axis(surplus, order_code, axis=1)
+                )
+                # Donor dipilih acak sebanyak kekurangan
+                pick = np.argsort(
+                    np.where(donor, priority[schedule_index, order], np.inf), axis=1
+                )
+                take = np.arange(total_nurse) < np.minimum(
+                    deficit, np.count_nonzero(donor, axis=1)
+                )[:, None]
+                schedule, position = np.nonzero(take)
+                nurse = order[schedule, pick[schedule, position]]
+                np.subtract.at(count, (schedule, code[schedule, nurse]), 1)
+                count[:, shift] += np.count_nonzero(take, axis=1)
+                code[schedule, nurse] = shift
+            shift_code[rows, :, column] = code
+
+        if out is None:
+            out = nurse_arrays.copy()
+        np.copyto(
+            out,
+            current.reshape(nurse_arrays.shape),
+            where=(current != original).reshape(nurse_arrays.shape),
         )
+        return out
 
-        return cost
+    def cost(self, nurse_array, upper_bound: float = None) -> float:
+        """Fungsi untuk menghitung total cost dari model NSP
+
+        Args:
+            upper_bound (float): Jika diberikan, perhitungan berhenti lebih awal
+                begitu batas bawah cost sudah >= upper_bound (lihat bounded_cost_batch)
+
+        Returns:
+            cost: Nilai cost dari model NSP (atau batas bawahnya yang >= upper_bound)
+        """
+        # nurse_array = nurse_array.reshape(self.unit_total_nurse, 4 * self.day)
+        # nurse_array = np.round(nurse_array)
+        
+        nurse_array = np.asarray(nurse_array).reshape(-1,self.day)
+
+        # Seluruh constraint dihitung dari satu histogram pola transisi
+        cost, _ = self.cost_batch(nurse_array[None], upper_bound=upper_bound)
+        return cost[0]
         """cost = 0
         cost = (
             self.hard_constraint_multiplier
@@ -294,41 +1416,360 @@ class NSP_Class:
         cost = float(1) / (cost+1)
         return cost"""
 
+    def cost_batch(
+        self, nurse_arrays, profile: dict = None, upper_bound=None
+    ) -> tuple:
+        """Fungsi untuk menghitung cost dari banyak jadwal sekaligus (satu populasi)
+        dalam satu kali proses vektorisasi
+
+        Args:
+            nurse_arrays (np.ndarray): Kumpulan jadwal (Populasi x Perawat x Hari)
+                atau (Populasi x Perawat*Hari)
+            profile (dict): Jika diberikan, waktu (detik) tiap tahap perhitungan
+                ditambahkan ke dictionary ini dengan key nama constraint. Seluruh
+                aturan transisi dihitung bersama dalam satu histogram sehingga
+                waktunya tercatat di key "transition_rules", aturan jendela di key
+                "window_rules"
+            upper_bound: Batas atas cost (skalar atau per jadwal). Jadwal yang cost-nya
+                pasti >= upper_bound tidak dihitung penuh (lihat bounded_cost_batch).
+                Backend "numba" selalu menghitung penuh.
+
+        Returns:
+            cost: Total cost tiap jadwal (Populasi)
+            breakdown: Cost tiap constraint untuk tiap jadwal (Populasi x Constraint),
+                urutan kolom sesuai constraint_names
+        """
+        nurse_arrays = np.asarray(nurse_arrays)
+        nurse_arrays = nurse_arrays.reshape(nurse_arrays.shape[0], -1, self.day)
+        if self.cost_cache is not None:
+            return self.cached_cost_batch(nurse_arrays, profile, upper_bound)
+        if upper_bound is None or self.cost_backend == "numba":
+            return self.compute_cost_batch(nurse_arrays, profile)
+        cost, breakdown, _ = self.bounded_cost_batch(nurse_arrays, upper_bound, profile)
+        return cost, breakdown
+
+    def cached_cost_batch(
+        self, nurse_arrays, profile: dict = None, upper_bound=None
+    ) -> tuple:
+        """Fungsi cost_batch melalui cost_cache: hanya jadwal yang belum ada di cache
+        yang dihitung (lihat cost_batch). Entry menyimpan (cost, breakdown, complete),
+        hasil yang berhenti lebih awal (batas bawah) hanya dipakai ulang jika batas
+        bawahnya tetap >= upper_bound yang diminta.
+        """
+        # Pengali constraint berupa atribut biasa, perubahannya dicek setiap batch
+        multiplier = (self.hard_constraint_multiplier, self.soft_constraint_multiplier)
+        if multiplier != self._cache_multiplier:
+            self.clear_cache()
+            self._cache_multiplier = multiplier
+        shift_code = to_shift_code(nurse_arrays)
+        total_population = len(shift_code)
+        if upper_bound is not None:
+            upper_bound = np.broadcast_to(upper_bound, total_population)
+        keys = [self.cost_cache.key(code) for code in shift_code]
+        entries = [
+            self.cost_cache.get(
+                key,
+                lambda entry, index=index: entry[2]
+                or (upper_bound is not None and entry[0] >= upper_bound[index]),
+            )
+            for index, key in enumerate(keys)
+        ]
+        miss = [index for index, entry in enumerate(entries) if entry is None]
+        if miss:
+            if upper_bound is None or self.cost_backend == "numba":
+                miss_cost, miss_breakdown = self.compute_cost_batch(
+                    shift_code[miss], profile
+                )
+                complete = np.ones(len(miss), dtype=bool)
+            else:
+                miss_cost, miss_breakdown, complete = self.bounded_cost_batch(
+                    shift_code[miss], upper_bound[miss], profile
+                )
+            for index, cost, breakdown, entry_complete in zip(
+                miss, miss_cost, miss_breakdown, complete
+            ):
+                entries[index] = (cost, breakdown, bool(entry_complete))
+                self.cost_cache.put(keys[index], entries[index])
+        cost = np.array([entry[0] for entry in entries])
+        breakdown = np.stack([entry[1] for entry in entries])
+        return cost, breakdown
+
+    def clear_cache(self) -> None:
+        """Fungsi untuk mengosongkan cost_cache, dipanggil setiap kali aturan, hari
+        batas, backend, atau pengali constraint berubah sehingga cost lama tidak lagi
+        berlaku
+        """
+        if self.cost_cache is not None:
+            self.cost_cache.clear()
+
+    def cache_stats(self) -> dict:
+        """Fungsi untuk mengambil statistik cost_cache (None jika cache tidak aktif)"""
+        if self.cost_cache is None:
+            return None
+        return self.cost_cache.stats()
+
+    def compute_cost_batch(self, nurse_arrays, profile: dict = None) -> tuple:
+        """Fungsi perhitungan cost_batch tanpa cache
+
+        Args:
+            nurse_arrays (np.ndarray): Kumpulan jadwal (Populasi x Perawat x Hari)
+            profile (dict): Lihat cost_batch
+
+        Returns:
+            cost: Total cost tiap jadwal (Populasi)
+            breakdown: Cost tiap constraint (Populasi x Constraint)
+        """
+        if self.cost_backend == "numba":
+            start = time.perf_counter()
+            if self.boundary.shape[1]:
+                shift_code = to_shift_code(nurse_arrays)
+                breakdown = self._kernel_breakdown(
+                    _cost_batch_kernel, self.extend_boundary(shift_code)
+                )
+                breakdown[:, 0] = self.minimum_shift_cost_batch(shift_code)[0]
+                breakdown[:, 2:] -= self.boundary_cost
+            else:
+                breakdown = self._kernel_breakdown(_cost_batch_kernel, nurse_arrays)
+            if profile is not None:
+                _add_time(profile, "numba_kernel", start)
+            return self.total_cost(breakdown), breakdown
+
+        start = time.perf_counter()
+        total_population = len(nurse_arrays)
+        shift_code = to_shift_code(nurse_arrays)
+        if profile is not None:
+            start = _add_time(profile, "to_shift_code", start)
+
+        cost_minimum_shift, _ = self.minimum_shift_cost_batch(shift_code)
+        if profile is not None:
+            start = _add_time(profile, "hard_constraint_cost_minimum_shift", start)
+        cost_one_per_day = np.zeros(total_population, dtype=cost_minimum_shift.dtype)
+        if profile is not None:
+            start = _add_time(profile, "hard_constraint_cost_one_per_day", start)
+
+        # Cost seluruh aturan transisi dari histogram kode pola x tabel penalti
+        extended = self.extend_boundary(shift_code)
+        cost_transition = self.transition_histogram(extended) @ self.transition_penalty
+        if profile is not None:
+            start = _add_time(profile, "transition_rules", start)
+
+        cost_window = self.window_cost_batch(extended)
+        if profile is not None:
+            _add_time(profile, "window_rules", start)
+
+        breakdown = np.column_stack(
+            (cost_minimum_shift, cost_one_per_day, cost_transition, cost_window)
+        )
+        if self.boundary.shape[1]:
+            breakdown[:, 2:] -= self.boundary_cost
+        return self.total_cost(breakdown), breakdown
+
+    def minimum_shift_cost_batch(self, shift_code) -> tuple:
+        """Fungsi untuk menghitung kekurangan minimum shift tiap jadwal
+
+        Args:
+            shift_code (np.ndarray): Kode shift (Populasi x Perawat x Hari)
+
+        Returns:
+            cost_minimum_shift: Cost hard constraint minimum shift (Populasi)
+            nurse_total_shift: Jumlah perawat tiap kode shift per hari
+                (Populasi x Hari x 5)
+        """
+        total_population, _, day = shift_code.shape
+        # Jumlah perawat tiap kode shift per hari dengan satu bincount (Populasi x Hari x 5)
+        day_index = np.arange(total_population)[:, None, None] * day + np.arange(day)
+        nurse_total_shift = np.bincount(
+            (day_index * 5 + shift_code).ravel(), minlength=total_population * day * 5
+        ).reshape(total_population, day, 5)
+        minimum_shift = np.asarray(self.unit_minimum_shift)[:3]
+        array_difference = nurse_total_shift[:, :, :3] - minimum_shift
+        cost_minimum_shift = -np.sum(
+            np.where(array_difference < 0, array_difference, 0), axis=(1, 2)
+        )
+        return cost_minimum_shift, nurse_total_shift
+
+    def bounded_cost_batch(self, nurse_arrays, upper_bound, profile: dict = None) -> tuple:
+        """Fungsi cost_batch dengan early exit. Cost dihitung bertahap dari yang
+        paling murah: minimum shift, lalu aturan transisi satu per satu (hard,
+        berpenalti negatif, kemudian soft) dengan mencocokkan pola langsung, lalu
+        aturan jendela (hard, kemudian soft). Setiap
+        tahap dihitung batas bawah cost (aturan berpenalti negatif yang belum
+        dihitung dianggap muncul sebanyak mungkin, yaitu jumlah shift paling jarang
+        pada polanya, aturan soft lain dianggap 0), jadwal yang batas bawahnya sudah
+        >= upper_bound tidak dilanjutkan ke tahap berikutnya.
+
+        Args:
+            nurse_arrays (np.ndarray): Kumpulan jadwal (Populasi x Perawat x Hari)
+            upper_bound: Batas atas cost (skalar atau per jadwal)
+            profile (dict): Lihat cost_batch
+
+        Returns:
+            cost: Total cost tiap jadwal, atau batas bawahnya (>= upper_bound) untuk
+                jadwal yang berhenti lebih awal (Populasi)
+            breakdown: Cost tiap constraint, untuk jadwal yang berhenti lebih awal
+                kolom yang belum dihitung berisi batas bawahnya (Populasi x Constraint)
+            complete: True untuk jadwal yang cost-nya dihitung penuh (Populasi)
+        """
+        start = time.perf_counter()
+        shift_code = to_shift_code(nurse_arrays)
+        total_population, _, day = shift_code.shape
+        upper_bound = np.broadcast_to(upper_bound, total_population)
+        # Batas bawah hanya berlaku jika pengali hard constraint tidak negatif
+        prune = self.hard_constraint_multiplier >= 0
+        if profile is not None:
+            start = _add_time(profile, "to_shift_code", start)
+
+        # Minimum shift, aturan transisi diisi batas bawahnya
+        cost_minimum_shift, nurse_total_shift = self.minimum_shift_cost_batch(shift_code)
+        breakdown = np.zeros(
+            (total_population, len(self.constraint_names)),
+            dtype=np.result_type(
+                cost_minimum_shift.dtype,
+                self.transition_penalty.dtype,
+                *[penalty for _, _, _, _, penalty, _ in self.window_rules],
+            ),
+        )
+        breakdown[:, 0] = cost_minimum_shift
+        # Aturan transisi dan jendela dihitung pada jadwal yang diawali hari batas
+        extended = self.extend_boundary(shift_code)
+        day = extended.shape[2]
+        shift_total = nurse_total_shift.sum(axis=1) + self.boundary_shift_total
+        for rule, (_, pattern, penalty, _) in enumerate(self.transition_rules):
+            if penalty < 0:
+                breakdown[:, 2 + rule] = penalty * np.min(
+                    [
+                        shift_total[:, list(np.atleast_1d(shift))].sum(axis=1)
+                        for shift in pattern
+                    ],
+                    axis=0,
+                ) - self.boundary_cost[rule]
+        cost = self.total_cost(breakdown)
+        alive = np.flatnonzero(cost < upper_bound) if prune else np.arange(
+            total_population
+        )
+        computed_rules = np.zeros(total_population, dtype=np.intp)
+        if profile is not None:
+            start = _add_time(profile, "hard_constraint_cost_minimum_shift", start)
+
+        # Aturan transisi: hard dulu, lalu berpenalti negatif, lalu soft
+        order = sorted(
+            range(len(self.transition_rules)),
+            key=lambda rule: (
+                not self.transition_rules[rule][3],
+                self.transition_rules[rule][2] >= 0,
+            ),
+        )
+        for rule in order:
+            if not len(alive):
+                break
+            name, pattern, penalty, _ = self.transition_rules[rule]
+            code = extended[alive]
+            width = day - len(pattern) + 1
+            match = _pattern_match(code[:, :, : max(width, 0)], pattern[0])
+            for position in range(1, len(pattern)):
+                if width <= 0:
+                    # Pola lebih panjang dari jumlah hari
+                    break
+                match &= _pattern_match(
+                    code[:, :, position : position + width], pattern[position]
+                )
+            breakdown[alive, 2 + rule] = (
+                penalty * np.count_nonzero(match, axis=(1, 2)) - self.boundary_cost[rule]
+            )
+            cost[alive] = self.total_cost(breakdown[alive])
+            computed_rules[alive] += 1
+            if prune:
+                alive = alive[cost[alive] < upper_bound[alive]]
+            if profile is not None:
+                start = _add_time(profile, name, start)
+
+        # Aturan jendela: hard dulu, lalu soft
+        order = sorted(
+            range(len(self.window_rules)), key=lambda rule: not self.window_rules[rule][5]
+        )
+        for rule in order:
+            if not len(alive):
+                break
+            column = self.window_column + rule
+            breakdown[alive, column] = (
+                self.window_cost_batch(extended[alive], [rule])[:, 0]
+                - self.boundary_cost[column - 2]
+            )
+            cost[alive] = self.total_cost(breakdown[alive])
+            computed_rules[alive] += 1
+            if prune:
+                alive = alive[cost[alive] < upper_bound[alive]]
+            if profile is not None:
+                start = _add_time(profile, self.window_rules[rule][0], start)
+
+        complete = computed_rules == len(self.transition_rules) + len(self.window_rules)
+        return cost, breakdown, complete
+
+    def _kernel_breakdown(self, kernel, nurse_array) -> np.ndarray:
+        """Fungsi untuk menjalankan kernel cost dan menyamakan tipe hasilnya
+        dengan backend numpy (int jika unit_minimum_shift dan penalti int). Kolom
+        aturan jendela dihitung dengan window_cost_batch.
+        """
+        minimum_shift = np.asarray(self.unit_minimum_shift)
+        breakdown = kernel(
+            np.ascontiguousarray(nurse_array),
+            minimum_shift[:3].astype(np.float64),
+            self.transition_lengths,
+            self.transition_offsets,
+            self._transition_penalty_kernel,
+        )
+        if self.window_rules:
+            shift_code = to_shift_code(nurse_array).reshape(-1, *nurse_array.shape[-2:])
+            breakdown = np.concatenate(
+                (
+                    breakdown,
+                    self.window_cost_batch(shift_code).reshape(
+                        *breakdown.shape[:-1], -1
+                    ),
+                ),
+                axis=-1,
+            )
+        return breakdown.astype(
+            np.result_type(
+                minimum_shift.dtype,
+                self.transition_penalty.dtype,
+                *[penalty for _, _, _, _, penalty, _ in self.window_rules],
+            )
+        )
+
+    def delta_state(self, nurse_array) -> "DeltaCost":
+        """Fungsi untuk membuat state delta cost dari sebuah jadwal, dipakai untuk
+        menghitung perubahan cost dari perubahan satu sel dalam O(1)
+
+        Returns:
+            delta_cost: DeltaCost dari jadwal
+        """
+        return DeltaCost(self, nurse_array)
+
+    def constraint_cost(self, nurse_array, name: str):
+        """Fungsi untuk mengambil cost satu constraint dari breakdown cost_batch,
+        sehingga nilainya selalu sama dengan yang dipakai cost
+
+        Args:
+            nurse_array (np.ndarray): Jadwal (Perawat x Hari)
+            name (str): Nama constraint (lihat constraint_names)
+
+        Returns:
+            cost: Cost constraint tersebut, 0 jika constraint tidak dipakai
+        """
+        if name not in self.constraint_names:
+            return 0
+        nurse_array = np.asarray(nurse_array).reshape(1, -1, self.day)
+        _, breakdown = self.cost_batch(nurse_array)
+        return breakdown[0, self.constraint_names.index(name)]
+
     def hard_constraint_cost_minimum_shift(self, nurse_array) -> int:
         """Fungsi untuk menghitung total cost dari hard constraint "minimum shift terpenuhi"
 
         Returns:
             cost_minimum_shift: Total cost "minimum shift"
         """
-        # # Menghitung total perawat per shift per hari (sum ke bawah)
-        # array_shift_sum = np.sum(nurse_array, axis=0)
-        # # Membuat array total perawat per shift per hari menjadi kolom (Hari x 4)
-        # array_rearange = np.reshape(array_shift_sum, (-1, 4))
-        # # Menggunakan 3 kolom awal array sebelumnya (karena kolom 4 libur sehingga tidak dihitung)
-        # # dan memastikan apakah nilainya sesuai dengan shift minimum
-        # array_difference = array_rearange - self.unit_minimum_shift
-        # array_check = -np.where(array_difference < 0, array_difference, 0)
-        # # Menghitung total cost
-        # cost_minimum_shift = np.sum(array_check)
-        
-        nurse_array_HC134 = np.count_nonzero(nurse_array == 0, axis=0)
-        nurse_array_HC134_Noon = np.count_nonzero(nurse_array == 1, axis=0)
-        nurse_array_HC134_Night = np.count_nonzero(nurse_array == 2, axis=0)
-        nurse_array_HC134_Holiday = np.count_nonzero(nurse_array == 3, axis=0)
-        nurse_total_shift = np.vstack(
-            (
-                nurse_array_HC134,
-                nurse_array_HC134_Noon,
-                nurse_array_HC134_Night,
-                nurse_array_HC134_Holiday,
-            )
-        ).T
-        array_difference = nurse_total_shift - self.unit_minimum_shift
-        check_if_not_minimal = np.sum(
-            np.where(array_difference[:, :3] < 0, array_difference[:, :3], 0)
-        )
-        cost_minimum_shift = -check_if_not_minimal
-        return cost_minimum_shift
+        return self.constraint_cost(nurse_array, "hard_constraint_cost_minimum_shift")
 
     def hard_constraint_cost_one_per_day(self, nurse_array) -> int:
         """Fungsi untuk menghitung total cost dari hard constraint "satu shift per hari"
@@ -336,105 +1777,568 @@ class NSP_Class:
         Returns:
             cost_one_per_day: Total cost "satu shift per hari"
         """
-        # # Membuat array menjadi kolom (Total Perawat*Hari x 4)
-        # array_compute = np.reshape(nurse_array, (-1, 4))
-        # # Menghitung total (ke samping) untuk mendapatkan jumlah shift per hari
-        # array_compute_sum = np.sum(array_compute, axis=1)
-        # # Memastikan apakah jumlah shift per hari lebih dari 1
-        # array_check = (array_compute_sum > 1) * 1
-        # # Menghitung total cost
-        # cost_one_per_day = np.sum(array_check)
-        
-        # Karena sudah pasti satu shift per harinya 
-        cost_one_per_day = 0 
-        return cost_one_per_day
+        return self.constraint_cost(nurse_array, "hard_constraint_cost_one_per_day")
 
     def hard_constraint_cost_night_day(self, nurse_array):
-        """FUngsi untuk menghitung total cost dari hard constraint "Jika seorang perawat bertugas pada shift malam maka
-            perawat tersebut tidak bekerja pada shift pagi pada hari
-            berikutnya"
+        """Fungsi untuk menghitung total cost dari hard constraint "shift malam tidak
+        diikuti shift pagi pada hari berikutnya"
 
         Returns:
             cost_night_day : cost perawat dengan shift malam diikuti dengan shift pagi
         """
-        # array_night = nurse_array[:, 2:-2:4] * nurse_array[:, 4::4]
-        # cost_night_day = np.sum(array_night)
-        
-        where_night = np.argwhere(nurse_array==2)
-        where_night_plus = where_night+[0,1]
-        where_more_than_max = np.argwhere(where_night_plus[:,1]>self.day-1)
-        where_night_plus = np.delete(where_night_plus,(where_more_than_max*2,where_more_than_max*2+1)).reshape(-1,2,)
-        nurse_array_plus = nurse_array[where_night_plus[:,0],where_night_plus[:,1]]
-        cost_night_day = np.sum(np.where(nurse_array_plus==0,1,0))
-        return cost_night_day
+        return self.constraint_cost(nurse_array, "hard_constraint_cost_night_day")
 
     def soft_constraint_cost_noon_shift(self, nurse_array) -> int:
-        """Fungsi untuk menghitung total cost dari soft constraint "menghindari setelah shift siang diikuti dengan shift pagi
-            dihari berikutnya (dikarenakan perawat akan kelelahan
-            secara fisik karena terus bekerja pada shift siang yaitu
-            dimulai pukul 14.00 hingga 21.00 lalu dilanjutkan pada
-            shift pagi dimulai pukul 07.00 pagi di hari berikutnya.)
-            "
+        """Fungsi untuk menghitung total cost dari soft constraint "menghindari shift
+        sore diikuti dengan shift pagi dihari berikutnya"
 
         Returns:
             cost_noon_shift: cost soft constraint shift sore
         """
-        # Membuat array sore (hari 1 -> Total Hari-1)
-        # array_noon = nurse_array[:, 1:-3:4] * nurse_array[:, 4::4]
-        # cost_noon_shift = np.sum(array_noon)
-        
-        where_noon = np.argwhere(nurse_array==1)
-        where_noon_plus = where_noon+[0,1]
-        where_more_than_max = np.argwhere(where_noon_plus[:,1]>self.day-1)
-        where_noon_plus = np.delete(where_noon_plus,(where_more_than_max*2,where_more_than_max*2+1)).reshape(-1,2,)
-        nurse_array_plus = nurse_array[where_noon_plus[:,0],where_noon_plus[:,1]]
-        cost_noon_shift = np.sum(np.where(nurse_array_plus==0,1,0))
-        return cost_noon_shift
+        return self.constraint_cost(nurse_array, "soft_constraint_cost_noon_shift")
 
     def soft_constraint_cost_morning_shift(self, nurse_array) -> int:
-        """Fungsi untuk menghitung total cost dari soft constraint "Menghindari setelah shift pagi diikuti dengan shift malam
-            dihari berikutnya (agar perawat tidak mendapatkan pola
-            bekerja seperti ini dikarenakan waktu istirahat yang
-            didapatkan terlalu panjang sehingga akan menurunkan
-            motivasi dari perawat untuk bekerja.)
-
+        """Fungsi untuk menghitung total cost dari soft constraint "menghindari shift
+        pagi diikuti dengan shift malam dihari berikutnya"
 
         Returns:
             cost_morning_shift: cost soft constraint shift pagi
         """
-        # array_morning = nurse_array[:, :-4:4] * nurse_array[:, 6::4]
-        # cost_morning_shift = np.sum(array_morning)
-        
-        where_morning = np.argwhere(nurse_array==0)
-        where_morning_plus = where_morning+[0,1]
-        where_more_than_max = np.argwhere(where_morning_plus[:,1]>self.day-1)
-        where_morning_plus = np.delete(where_morning_plus,(where_more_than_max*2,where_more_than_max*2+1)).reshape(-1,2,)
-        nurse_array_plus = nurse_array[where_morning_plus[:,0],where_morning_plus[:,1]]
-        cost_morning_shift = np.sum(np.where(nurse_array_plus==2,1,0))
-        return cost_morning_shift
+        return self.constraint_cost(nurse_array, "soft_constraint_cost_morning_shift")
 
     def soft_constraint_cost_night_holiday_noon(self, nurse_array) -> int:
-        """Fungsi untuk menghitung total cost dari soft constraint "memberikan jadwal jaga sore setelah hari libur yang
-            didapat setelah jaga malam
+        """Fungsi untuk menghitung total cost dari soft constraint "memberikan jadwal
+        jaga sore setelah hari libur yang didapat setelah jaga malam"
 
         Returns:
             cost_night_holiday_noon: cost soft constraint malam libur sore
         """
-        # array_night_holiday_noon = (
-        #     nurse_array[:, 2:-8:4] * nurse_array[:, 7:-4:4] * nurse_array[:, 9::4]
-        # )
-        # cost_night_holiday_noon = -np.sum(array_night_holiday_noon)
-        
-        where_night = np.argwhere(nurse_array==2)
-        where_night_plus = where_night+[0,1]
-        where_night_plus_plus = where_night_plus+[0,1]
-        where_more_than_max = np.argwhere(where_night_plus_plus[:,1]>self.day-1)
-        where_night_plus = np.delete(where_night_plus,(where_more_than_max*2,where_more_than_max*2+1)).reshape(-1,2,)
-        where_night_plus_plus = np.delete(where_night_plus_plus,(where_more_than_max*2,where_more_than_max*2+1)).reshape(-1,2,)
-        nurse_array_plus = nurse_array[where_night_plus[:,0],where_night_plus[:,1]]
-        nurse_array_plus_plus = nurse_array[where_night_plus_plus[:,0],where_night_plus_plus[:,1]]
-        cost_night_holiday_noon=-np.sum(np.where(nurse_array_plus==3,1,0)*np.where(nurse_array_plus_plus==1,1,0))
-        return cost_night_holiday_noon
+        return self.constraint_cost(
+            nurse_array, "soft_constraint_cost_night_holiday_noon"
+        )
+
+
+class DeltaCost:
+    def __init__(self, NSP: NSP_Class, nurse_array: np.ndarray) -> None:
+        """Class untuk menghitung perubahan cost (delta) ketika satu sel jadwal
+        (perawat, hari) diubah, tanpa menghitung ulang cost seluruh jadwal.
+        Menyimpan jumlah shift per hari dan kode shift tiap perawat yang diawali
+        hari batas bulan sebelumnya (extended_array, nurse_array adalah bagian bulan
+        ini).
+
+        Args:
+            NSP (NSP_Class): Model NSP yang dipakai untuk menghitung cost
+            nurse_array (np.ndarray): Jadwal awal (Perawat x Hari) atau (Perawat*Hari)
+        """
+        self.NSP = NSP
+        self.boundary_days = NSP.boundary.shape[1]
+        self.extended_array = NSP.extend_boundary(
+            to_shift_code(nurse_array).reshape(1, -1, NSP.day)
+        )[0]
+        self.nurse_array = self.extended_array[:, self.boundary_days :]
+        # Jumlah perawat tiap kode shift per hari (Hari x 5)
+        self.shift_count = np.stack(
+            [np.count_nonzero(self.nurse_array == shift, axis=0) for shift in range(5)],
+            axis=1,
+        )
+        self.minimum_shift = np.asarray(NSP.unit_minimum_shift)[:3]
+        cost, breakdown = NSP.cost_batch(self.nurse_array[None])
+        self.cost = cost[0]
+        self.breakdown = breakdown[0]
+
+    def transition_cost(self, nurse: int, day: int, shift: int) -> np.ndarray:
+        """Fungsi untuk menghitung cost aturan transisi dari seluruh pola hari
+        berurutan yang melibatkan sel (nurse, day) jika sel tersebut berisi shift
+
+        Returns:
+            cost_transition: Cost tiap aturan transisi (urutan transition_rules)
+        """
+        row = self.extended_array[nurse]
+        total_day = len(row)
+        day = day + self.boundary_days
+        codes = []
+        for length, offset in zip(self.NSP.transition_lengths, self.NSP.transition_offsets):
+            for start in range(max(day - length + 1, 0), min(day, total_day - length) + 1):
+                code = 0
+                for position in range(start, start + length):
+                    code = code * 5 + (shift if position == day else int(row[position]))
+                codes.append(offset + code)
+        return self.NSP.transition_penalty[codes].sum(axis=0)
+
+    def window_cost(self, nurse: int, day: int, shift: int) -> np.ndarray:
+        """Fungsi untuk menghitung cost aturan jendela dari seluruh jendela yang
+        memuat sel (nurse, day) jika sel tersebut berisi shift
+
+        Returns:
+            cost_window: Cost tiap aturan jendela (urutan window_rules)
+        """
+        row = self.extended_array[nurse]
+        total_day = len(row)
+        day = day + self.boundary_days
+        cost_window = []
+        for rule, (_, _, window, limit, penalty, _) in enumerate(self.NSP.window_rules):
+            first, last = max(day - window + 1, 0), min(day, total_day - window)
+            counted = self.NSP.window_shift[rule][row[first : last + window]]
+            counted[day - first] = self.NSP.window_shift[rule, shift]
+            cumulative = np.concatenate(([0], np.cumsum(counted)))
+            count = cumulative[window:] - cumulative[:-window]
+            cost_window.append(penalty * (count - limit).clip(min=0).sum())
+        return np.array(cost_window)
+
+    def rule_cost(self, nurse: int, day: int, shift: int) -> np.ndarray:
+        """Fungsi untuk menghitung cost seluruh aturan transisi dan jendela yang
+        melibatkan sel (nurse, day) jika sel tersebut berisi shift
+
+        Returns:
+            cost_rule: Cost tiap aturan (urutan kolom breakdown mulai kolom 2)
+        """
+        cost_transition = self.transition_cost(nurse, day, shift)
+        if not self.NSP.window_rules:
+            return cost_transition
+        return np.concatenate((cost_transition, self.window_cost(nurse, day, shift)))
+
+    def rule_delta(self, nurse: int, day: int, shift: int, old_shift: int) -> np.ndarray:
+        """Fungsi untuk menghitung perubahan cost seluruh aturan transisi dan jendela
+        jika sel (nurse, day) diubah dari old_shift menjadi shift. Kode pola lama
+        dihitung sekali, kode pola baru hanya berbeda pada digit hari tersebut.
+        Jumlah shift seluruh jendela yang memuat sel berubah sama besar, sehingga
+        aturan jendela yang jumlahnya tidak berubah dilewati.
+
+        Returns:
+            delta_rule: Perubahan cost tiap aturan (urutan kolom breakdown mulai
+                kolom 2)
+        """
+        row = self.extended_array[nurse]
+        total_day = len(row)
+        day = day + self.boundary_days
+        change = shift - old_shift
+        old_codes, new_codes = [], []
+        for length, offset in zip(
+            self.NSP.transition_lengths.tolist(), self.NSP.transition_offsets.tolist()
+        ):
+            first, last = max(day - length + 1, 0), min(day, total_day - length)
+            cells = row[first : last + length].tolist()
+            for start in range(first, last + 1):
+                code = 0
+                for cell in cells[start - first : start - first + length]:
+                    code = code * 5 + cell
+                code += offset
+                old_codes.append(code)
+                new_codes.append(code + change * 5 ** (start + length - 1 - day))
+        penalty = self.NSP.transition_penalty
+        delta_rule = penalty[new_codes].sum(axis=0) - penalty[old_codes].sum(axis=0)
+        if not self.NSP.window_rules:
+            return delta_rule
+
+        delta_window = []
+        for rule, (_, _, window, limit, penalty, _) in enumerate(self.NSP.window_rules):
+            shift_mask = self.NSP.window_shift[rule]
+            change = int(shift_mask[shift]) - int(shift_mask[old_shift])
+            if change == 0:
+                delta_window.append(0)
+                continue
+            first, last = max(day - window + 1, 0), min(day, total_day - window)
+            cumulative = np.concatenate(
+                ([0], np.cumsum(shift_mask[row[first : last + window]]))
+            )
+            count = cumulative[window:] - cumulative[:-window]
+            delta_window.append(
+                penalty
+                * (
+                    (count + change - limit).clip(min=0) - (count - limit).clip(min=0)
+                ).sum()
+            )
+        return np.concatenate((delta_rule, delta_window))
+
+    def delta_breakdown(self, nurse: int, day: int, shift) -> np.ndarray:
+        """Fungsi untuk menghitung perubahan cost tiap constraint jika sel
+        (nurse, day) diubah menjadi shift
+
+        Returns:
+            delta_breakdown: Perubahan cost tiap constraint (urutan constraint_names)
+        """
+        shift = int(to_shift_code(shift))
+        old_shift = int(self.nurse_array[nurse, day])
+        delta_breakdown = np.zeros_like(self.breakdown)
+        if shift == old_shift:
+            return delta_breakdown
+
+        # Perubahan kekurangan minimum shift pada hari tersebut
+        count = self.shift_count[day]
+        if old_shift < 3:
+            delta_breakdown[0] += count[old_shift] <= self.minimum_shift[old_shift]
+        if shift < 3:
+            delta_breakdown[0] -= count[shift] < self.minimum_shift[shift]
+
+        delta_breakdown[2:] = self.rule_delta(nurse, day, shift, old_shift)
+        return delta_breakdown
+
+    def transition_cost_batch(self, nurses, days, shifts) -> np.ndarray:
+        """Versi batch transition_cost: cost aturan transisi untuk k sel sekaligus,
+        masing-masing dihitung terhadap jadwal saat ini. Tiap sel diambil potongan
+        baris selebar 2 * panjang pola - 1 di sekitarnya, kode seluruh pola yang
+        memuat sel tersebut dihitung dari pergeseran potongan itu.
+
+        Returns:
+            cost_transition: Cost tiap aturan transisi (k x Aturan)
+        """
+        rows = self.extended_array[nurses]
+        total_day = rows.shape[1]
+        days = np.asarray(days) + self.boundary_days
+        index = np.arange(len(days))
+        penalty = self.NSP.transition_penalty
+        cost_transition = np.zeros((len(days), penalty.shape[1]), dtype=penalty.dtype)
+        for length, offset in zip(self.NSP.transition_lengths, self.NSP.transition_offsets):
+            column = days[:, None] + np.arange(1 - length, length)
+            cell = rows[index[:, None], np.clip(column, 0, total_day - 1)]
+            cell[:, length - 1] = shifts
+            # Pola ke-j dimulai pada hari day - length + 1 + j (k x Panjang)
+            code = np.zeros((len(days), length), dtype=np.intp)
+            for position in range(length):
+                code = code * 5 + cell[:, position : position + length]
+            start = column[:, :length]
+            valid = (start >= 0) & (start <= total_day - length)
+            cost_transition += (
+                valid[:, None, :].astype(penalty.dtype) @ penalty[offset + code]
+            )[:, 0]
+        return cost_transition
+
+    def window_cost_batch(self, nurses, days, shifts) -> np.ndarray:
+        """Versi batch window_cost: cost aturan jendela untuk k sel sekaligus. Tiap
+        sel diambil potongan baris selebar 2 * jendela - 1 di sekitarnya, jumlah
+        shift tiap jendela dihitung dari selisih cumulative sum potongan tersebut.
+
+        Returns:
+            cost_window: Cost tiap aturan jendela (k x Aturan)
+        """
+        rows = self.extended_array[nurses]
+        total_day = rows.shape[1]
+        days = np.asarray(days) + self.boundary_days
+        index = np.arange(len(days))
+        if not self.NSP.window_rules:
+            return np.zeros((len(days), 0), dtype=np.intp)
+        cost_window = []
+        for rule, (_, _, window, limit, penalty, _) in enumerate(self.NSP.window_rules):
+            column = days[:, None] + np.arange(1 - window, window)
+            counted = self.NSP.window_shift[rule][
+                rows[index[:, None], np.clip(column, 0, total_day - 1)]
+            ]
+            counted &= (column >= 0) & (column < total_day)
+            counted[:, window - 1] = self.NSP.window_shift[rule][shifts]
+            cumulative = np.zeros((len(days), 2 * window), dtype=np.intp)
+            np.cumsum(counted, axis=1, out=cumulative[:, 1:])
+            count = cumulative[:, window:] - cumulative[:, :window]
+            # Jendela ke-j dimulai pada hari day - window + 1 + j
+            start = column[:, :window]
+            valid = (start >= 0) & (start <= total_day - window)
+            cost_window.append(
+                penalty * np.sum((count - limit).clip(min=0) * valid, axis=1)
+            )
+        return np.stack(cost_window, axis=1)
+
+    def rule_cost_batch(self, nurses, days, shifts) -> np.ndarray:
+        """Versi batch rule_cost: cost seluruh aturan transisi dan jendela untuk k
+        sel sekaligus
+
+        Returns:
+            cost_rule: Cost tiap aturan (k x Aturan)
+        """
+        cost_transition = self.transition_cost_batch(nurses, days, shifts)
+        if not self.NSP.window_rules:
+            return cost_transition
+        return np.concatenate(
+            (cost_transition, self.window_cost_batch(nurses, days, shifts)), axis=1
+        )
+
+    def delta_breakdown_batch(self, nurses, days, shifts) -> np.ndarray:
+        """Versi batch delta_breakdown: perubahan cost tiap constraint untuk k
+        perubahan satu sel, masing-masing terhadap jadwal saat ini (independen)
+
+        Args:
+            nurses: Index perawat tiap perubahan (k)
+            days: Index hari tiap perubahan (k)
+            shifts: Shift baru tiap perubahan (k)
+
+        Returns:
+            delta_breakdown: Perubahan cost tiap constraint (k x Constraint)
+        """
+        nurses = np.asarray(nurses, dtype=np.intp)
+        days = np.asarray(days, dtype=np.intp)
+        shifts = to_shift_code(np.asarray(shifts)).astype(np.intp)
+        old_shifts = self.nurse_array[nurses, days].astype(np.intp)
+        index = np.arange(len(days))
+        delta_breakdown = np.zeros(
+            (len(days), len(self.breakdown)), dtype=self.breakdown.dtype
+        )
+
+        # Perubahan kekurangan minimum shift pada hari tersebut
+        count = self.shift_count[days]
+        minimum_shift = np.append(self.minimum_shift, (0, 0))
+        delta_breakdown[:, 0] += (old_shifts < 3) & (
+            count[index, old_shifts] <= minimum_shift[old_shifts]
+        )
+        delta_breakdown[:, 0] -= (shifts < 3) & (
+            count[index, shifts] < minimum_shift[shifts]
+        )
+
+        # Cost aturan shift baru dan shift lama dihitung dalam satu batch (2k)
+        cost_rule = self.rule_cost_batch(
+            np.concatenate((nurses, nurses)),
+            np.concatenate((days, days)),
+            np.concatenate((shifts, old_shifts)),
+        )
+        delta_breakdown[:, 2:] = cost_rule[: len(days)] - cost_rule[len(days) :]
+        delta_breakdown[shifts == old_shifts] = 0
+        return delta_breakdown
+
+    def delta_batch(self, nurses, days, shifts) -> np.ndarray:
+        """Fungsi untuk menghitung perubahan total cost k perubahan satu sel
+        sekaligus (lihat delta_breakdown_batch)
+
+        Returns:
+            delta_cost: Perubahan total cost tiap perubahan (k)
+        """
+        return self.NSP.total_cost(self.delta_breakdown_batch(nurses, days, shifts))
+
+    def swap_delta_matrix(self, day: int) -> np.ndarray:
+        """Fungsi untuk menghitung perubahan total cost seluruh pertukaran shift dua
+        perawat pada satu hari sekaligus. Pertukaran tidak mengubah jumlah shift per
+        hari, sehingga hanya cost aturan transisi dan jendela di sekitar hari tersebut
+        yang berubah.
+
+        Args:
+            day (int): Index hari
+
+        Returns:
+            delta_cost: Perubahan total cost jika shift perawat a dan b ditukar
+                (Perawat x Perawat)
+        """
+        total_nurse = len(self.nurse_array)
+        nurses = np.repeat(np.arange(total_nurse), 5)
+        shifts = np.tile(np.arange(5), total_nurse)
+        weight = np.where(
+            self.NSP.hard_constraint_mask[2:], self.NSP.hard_constraint_multiplier, 1
+        )
+        # Cost aturan tiap perawat jika hari tersebut berisi shift 0-4 (Perawat x 5)
+        cost_rule = (
+            self.rule_cost_batch(nurses, np.full_like(nurses, day), shifts) @ weight
+        ).reshape(total_nurse, 5)
+        shift = self.nurse_array[:, day].astype(np.intp)
+        own = cost_rule[np.arange(total_nurse), shift]
+        # cross[a, b] = cost aturan perawat a jika mendapat shift perawat b
+        cross = cost_rule[:, shift]
+        return cross - own[:, None] + cross.T - own[None, :]
+
+    def improving_swaps(self, day: int) -> list:
+        """Fungsi untuk memilih pertukaran yang menurunkan cost pada satu hari.
+        Pertukaran dengan pasangan perawat berbeda saling independen, sehingga dipilih
+        secara greedy dari delta paling negatif dengan tiap perawat paling banyak
+        satu kali.
+
+        Returns:
+            swaps: List (perawat a, perawat b)
+        """
+        delta = self.swap_delta_matrix(day)
+        nurse_a, nurse_b = np.nonzero(np.triu(delta < 0, 1))
+        used = np.zeros(len(delta), dtype=bool)
+        swaps = []
+        for index in np.argsort(delta[nurse_a, nurse_b], kind="stable"):
+            a, b = nurse_a[index], nurse_b[index]
+            if not used[a] and not used[b]:
+                used[a] = used[b] = True
+                swaps.append((a, b))
+        return swaps
+
+    def apply_swap(self, nurse_a: int, nurse_b: int, day: int) -> float:
+        """Fungsi untuk menukar shift perawat a dan b pada satu hari serta
+        memperbarui cost
+
+        Returns:
+            cost: Total cost jadwal setelah ditukar
+        """
+        shift_a = int(self.nurse_array[nurse_a, day])
+        shift_b = int(self.nurse_array[nurse_b, day])
+        delta_rule = self.rule_delta(nurse_a, day, shift_b, shift_a) + self.rule_delta(
+            nurse_b, day, shift_a, shift_b
+        )
+        self.nurse_array[nurse_a, day], self.nurse_array[nurse_b, day] = shift_b, shift_a
+        self.breakdown = self.breakdown.copy()
+        self.breakdown[2:] += delta_rule
+        self.cost = self.NSP.total_cost(self.breakdown)
+        return self.cost
+
+    def delta(self, nurse: int, day: int, shift) -> float:
+        """Fungsi untuk menghitung perubahan total cost jika sel (nurse, day)
+        diubah menjadi shift
+
+        Returns:
+            delta_cost: Perubahan total cost
+        """
+        return self.NSP.total_cost(self.delta_breakdown(nurse, day, shift))
+
+    def apply(self, nurse: int, day: int, shift, delta_breakdown=None) -> float:
+        """Fungsi untuk mengubah sel (nurse, day) menjadi shift dan memperbarui
+        jumlah shift per hari serta cost
+
+        Args:
+            delta_breakdown (np.ndarray): Hasil delta_breakdown perubahan ini terhadap
+                jadwal saat ini jika sudah dihitung, agar tidak dihitung ulang
+
+        Returns:
+            cost: Total cost jadwal setelah diubah
+        """
+        if delta_breakdown is None:
+            delta_breakdown = self.delta_breakdown(nurse, day, shift)
+        shift = int(to_shift_code(shift))
+        old_shift = self.nurse_array[nurse, day]
+        self.shift_count[day, old_shift] -= 1
+        self.shift_count[day, shift] += 1
+        self.nurse_array[nurse, day] = shift
+
+        self.breakdown = self.breakdown + delta_breakdown
+        self.cost = self.NSP.total_cost(self.breakdown)
+        return self.cost
+
+
+class Instrumentation:
+    operators = (
+        "initialization",
+        "propagation",
+        "breaking",
+        "refraction",
+        "local_search",
+        "repair",
+    )
+
+    def __init__(self) -> None:
+        """Kontainer statistik optimasi WWO: jumlah evaluasi cost, waktu, percobaan
+        dan perbaikan tiap operator, waktu tiap constraint, serta jumlah iterasi
+        yang memperbaiki best_fit. Ringkasan diambil dengan summary() atau to_json().
+        """
+        self.operator = {
+            name: {
+                "calls": 0,
+                "evaluations": 0,
+                "time": 0.0,
+                "attempts": 0,
+                "improvements": 0,
+            }
+            for name in self.operators
+        }
+        self.constraint_time = {}
+        self.iterations = 0
+        self.iteration_time = 0.0
+        self.best_improvements = 0
+
+    def record(
+        self,
+        operator: str,
+        start: float,
+        evaluations: int,
+        attempts: int,
+        improvements: int,
+    ) -> None:
+        """Fungsi untuk mencatat satu pemanggilan operator
+
+        Args:
+            operator (str): Nama operator (lihat operators)
+            start (float): Waktu mulai operator (perf_counter)
+            evaluations (int): Jumlah evaluasi cost yang dilakukan operator
+            attempts (int): Jumlah kandidat yang dicoba
+            improvements (int): Jumlah kandidat yang memperbaiki cost
+        """
+        stats = self.operator[operator]
+        stats["calls"] += 1
+        stats["evaluations"] += int(evaluations)
+        stats["time"] += time.perf_counter() - start
+        stats["attempts"] += int(attempts)
+        stats["improvements"] += int(improvements)
+
+    def record_iteration(self, start: float, improved: bool) -> None:
+        """Fungsi untuk mencatat satu iterasi WWO"""
+        self.iterations += 1
+        self.iteration_time += time.perf_counter() - start
+        self.best_improvements += bool(improved)
+
+    def summary(self) -> dict:
+        """Fungsi untuk membuat ringkasan statistik
+
+        Returns:
+            summary: Dictionary berisi statistik tiap operator (ditambah
+                success_rate dan time_share), waktu tiap constraint, jumlah iterasi,
+                dan improvement_rate (proporsi iterasi yang memperbaiki best_fit)
+        """
+        total_time = sum(stats["time"] for stats in self.operator.values())
+        operator = {}
+        for name, stats in self.operator.items():
+            operator[name] = dict(stats)
+            operator[name]["success_rate"] = (
+                stats["improvements"] / stats["attempts"] if stats["attempts"] else 0.0
+            )
+            operator[name]["time_share"] = (
+                stats["time"] / total_time if total_time else 0.0
+            )
+        return {
+            "operator": operator,
+            "constraint_time": dict(self.constraint_time),
+            "iterations": self.iterations,
+            "iteration_time": self.iteration_time,
+            "best_improvements": self.best_improvements,
+            "improvement_rate": (
+                self.best_improvements / self.iterations if self.iterations else 0.0
+            ),
+        }
+
+    def to_json(self, path: str = None, extra: dict = None) -> str:
+        """Fungsi untuk mengekspor ringkasan statistik ke JSON
+
+        Args:
+            path (str): File tujuan (None = hanya dikembalikan sebagai string)
+            extra (dict): Data tambahan yang digabung ke ringkasan
+
+        Returns:
+            summary_json: Ringkasan dalam format JSON
+        """
+        summary = self.summary()
+        summary.update(extra or {})
+        summary_json = json.dumps(summary, indent=2, default=float)
+        if path is not None:
+            with open(path, "w") as file:
+                file.write(summary_json)
+        return summary_json
+
+
+class Workspace:
+    def __init__(self, population: int, cells: int) -> None:
+        """Kontainer buffer kerja yang dibuat sekali per run WWO dan dipakai ulang
+        oleh operator (propagasi, refraksi, boundary_handle) lewat parameter out=,
+        sehingga iterasi tidak mengalokasikan array baru seukuran populasi.
+
+        Args:
+            population (int): Jumlah wave
+            cells (int): Jumlah sel jadwal (Perawat*Hari)
+        """
+        self.size = population * cells
+        self.buffers = {}
+
+    def buffer(self, name: str, shape: tuple, dtype=np.float64) -> np.ndarray:
+        """Fungsi untuk mengambil buffer bernama dengan bentuk shape. Buffer yang
+        sama dikembalikan di setiap pemanggilan, isinya tidak diinisialisasi.
+
+        Args:
+            name (str): Nama buffer (buffer berbeda untuk hasil yang dipakai bersamaan)
+            shape (tuple): Bentuk array yang dibutuhkan
+            dtype: Tipe data buffer
+
+        Returns:
+            buffer: View buffer dengan bentuk shape
+        """
+        size = int(np.prod(shape))
+        buffer = self.buffers.get(name)
+        if buffer is None or buffer.dtype != dtype or buffer.size < size:
+            buffer = np.empty(max(size, self.size), dtype=dtype)
+            self.buffers[name] = buffer
+        return buffer[:size].reshape(shape)
 
 
 class WWO:
@@ -452,6 +2356,23 @@ class WWO:
         upper_bound: float,
         lower_bound: float,
         x_population=1,
+        mode: str = "continuous",
+        engine: str = "loop",
+        workers: int = None,
+        time_limit: float = None,
+        max_evaluations: int = None,
+        target_cost: float = None,
+        stall_iterations: int = None,
+        checkpoint_path: str = None,
+        checkpoint_every: int = None,
+        checkpoint_seconds: float = None,
+        seed=None,
+        instrumentation: bool = False,
+        local_search: str = None,
+        local_search_passes: int = 1,
+        repair: bool = False,
+        warm_start: np.ndarray = None,
+        warm_start_perturbation: float = 0.05,
     ) -> None:
         """Inisialisasi WWO dengan NSP
 
@@ -465,7 +2386,42 @@ class WWO:
             k_max: int
             upper_bound: float
             lower_bound: float
+            mode: "continuous" (operator WWO kontinu) atau "discrete" (operator
+                langsung pada kode shift 0 1 2 3)
+            engine: "loop" (iterasi per wave) atau "vectorized" (seluruh populasi
+                diproses sekaligus, lihat optimize_vectorized)
+            workers: Jumlah proses untuk membangkitkan populasi awal (None = serial)
+            time_limit: Batas waktu optimasi dalam detik
+            max_evaluations: Batas jumlah evaluasi cost
+            target_cost: Optimasi berhenti jika best_fit <= target_cost
+            stall_iterations: Optimasi berhenti jika best_fit tidak membaik selama
+                sejumlah iterasi berturut-turut
+            checkpoint_path: File .npz untuk menyimpan checkpoint optimasi
+            checkpoint_every: Checkpoint disimpan setiap sejumlah iterasi
+            checkpoint_seconds: Checkpoint disimpan setiap sejumlah detik
+            seed: Seed (int, SeedSequence, atau np.random.Generator) untuk RNG
+                optimasi (None = memakai NSP.rng)
+            instrumentation: True untuk mencatat statistik tiap operator dan
+                constraint (lihat Instrumentation dan summary)
+            local_search: Local search pertukaran shift (lihat local_search), None
+                (tidak aktif), "propagation" (setiap wave yang membaik setelah
+                propagasi), atau "best" (wave terbaik setiap kali best_fit membaik)
+            local_search_passes: Jumlah maksimum putaran seluruh hari per local search
+            repair: True untuk memperbaiki setiap kandidat baru (populasi awal, hasil
+                propagasi, dan refraksi) dengan NSP.repair_batch sebelum dihitung
+                cost-nya
+            warm_start: Jadwal awal populasi (Perawat x Hari, label atau kode shift),
+                misal hasil bulan lalu atau jadwal yang diedit manual (lihat
+                NSP_Class.generate_warm_population), None = populasi acak
+            warm_start_perturbation: Proporsi sel yang ditukar pada tiap wave warm
+                start selain wave pertama
         """
+        if mode not in ("continuous", "discrete"):
+            raise ValueError(f"Mode WWO tidak dikenal: {mode}")
+        if local_search not in (None, "propagation", "best"):
+            raise ValueError(f"Local search WWO tidak dikenal: {local_search}")
+        if engine not in ("loop", "vectorized"):
+            raise ValueError(f"Engine WWO tidak dikenal: {engine}")
         self.NSP = NSP
         self.x_population = x_population
         self.iteration = iteration
@@ -478,170 +2434,755 @@ class WWO:
         self.k_max = k_max
         self.upper_bound = upper_bound
         self.lower_bound = lower_bound
-
-    def initialize_population(self) -> list:
-        """Fungsi untuk menginisialisasi populasi awal
+        self.mode = mode
+        self.engine = engine
+        self.workers = workers
+        self.time_limit = time_limit
+        self.max_evaluations = max_evaluations
+        self.target_cost = target_cost
+        self.stall_iterations = stall_iterations
+        self.checkpoint_path = checkpoint_path
+        self.checkpoint_every = checkpoint_every
+        self.checkpoint_seconds = checkpoint_seconds
+        self.rng = NSP.rng if seed is None else np.random.default_rng(seed)
+        self.instrumentation = Instrumentation() if instrumentation else None
+        self.local_search_mode = local_search
+        self.local_search_passes = local_search_passes
+        self.repair = repair
+        self.warm_start = warm_start
+        self.warm_start_perturbation = warm_start_perturbation
+        # Buffer kerja dan penghitung evaluasi sudah tersedia sebelum initialize,
+        # sehingga operator dapat dipanggil langsung
+        self.eval_count = 0
+        self.workspace = Workspace(x_population, NSP.unit_total_nurse * NSP.day)
+
+    def initialize_population(self) -> np.ndarray:
+        """Fungsi untuk menginisialisasi populasi awal berisi x_population jadwal
+        yang saling independen. Wave pertama adalah jadwal awal NSP, atau jadwal
+        warm_start beserta perturbasinya jika warm_start diberikan.
 
         Returns:
-            wave_population_list: List yang berisikan class untuk tiap populasinya
+            population: Array populasi (Populasi x Perawat*Hari), uint8 pada mode
+                discrete dan float64 pada mode continuous
         """
-        wave_population_list = []
-        for x in range(self.x_population):
-            wave_population_list.append(self.NSP)
-        # print(wave_population_list)
-        return wave_population_list
+        population = np.empty(
+            (self.x_population, self.NSP.unit_total_nurse * self.NSP.day),
+            dtype=np.uint8 if self.mode == "discrete" else np.float64,
+        )
+        if self.warm_start is not None:
+            population[:] = self.NSP.generate_warm_population(
+                self.warm_start,
+                self.x_population,
+                self.warm_start_perturbation,
+                rng=self.rng,
+            )
+            return population
+        population[0] = np.asarray(self.NSP.nurse_second_schedule).ravel()
+        if self.x_population > 1:
+            population[1:] = self.NSP.generate_population(
+                self.x_population - 1, workers=self.workers, rng=self.rng
+            )
+        return population
 
-    def cost_function(self, wave_population_list: list) -> list:
+    def cost_function(self, population: np.ndarray) -> np.ndarray:
         """Fungsi untuk menghitung cost dari setiap wave
         Args:
-            wave_population_list: List berisi wave
+            population: Array populasi (Populasi x Perawat*Hari)
         Returns:
-            cost_list: List berisi total cost dari setiap wave
+            cost_list: Array berisi total cost dari setiap wave
         """
-        cost_list = []
-        for wave in wave_population_list:
-            cost_list.append(wave.cost(wave.nurse_second_schedule))
-        print(cost_list)
+        cost_list = self.evaluate(population)
         return cost_list
 
-    def optimize(self) -> tuple:
+    def evaluate(self, population: np.ndarray, upper_bound=None) -> np.ndarray:
+        """Fungsi untuk menghitung cost beberapa jadwal sekaligus sambil menghitung
+        jumlah evaluasi cost (eval_count)
+
+        Args:
+            population: Array jadwal (Jumlah jadwal x Perawat*Hari), diperbaiki
+                langsung jika repair aktif
+            upper_bound: Batas atas cost tiap jadwal, jadwal yang cost-nya pasti
+                >= upper_bound hanya dihitung sampai batas bawahnya (early exit)
+
+        Returns:
+            cost: Total cost tiap jadwal
+        """
+        if self.repair:
+            start = self.operator_start()
+            before = population.copy() if start is not None else None
+            self.NSP.repair_batch(population, rng=self.rng, out=population)
+            if start is not None:
+                changed = np.any(population != before, axis=1)
+                self.operator_end(
+                    "repair", start, len(population), np.count_nonzero(changed)
+                )
+        self.eval_count += len(population)
+        profile = None
+        if self.instrumentation is not None:
+            profile = self.instrumentation.constraint_time
+        cost, _ = self.NSP.cost_batch(
+            population, profile=profile, upper_bound=upper_bound
+        )
+        return cost
+
+    def initialize(self) -> None:
+        """Fungsi untuk menginisialisasi state optimasi: populasi, cost, panjang dan
+        tinggi gelombang, beta, solusi terbaik, serta penghitung budget
+        """
+        self.iter = 0
+        self.eval_count = 0
+        self.stall_count = 0
+        self.stop_reason = None
+        self.start_time = time.perf_counter()
+        self.workspace = Workspace(
+            self.x_population, self.NSP.unit_total_nurse * self.NSP.day
+        )
+        if self.instrumentation is not None:
+            self.instrumentation = Instrumentation()
 
         # Inisialisasi populasi awal
-        wave_population_list = self.initialize_population()
+        self.population = self.initialize_population()
         # Inisialisasi cost awal
-        wave_population_cost_list = self.cost_function(wave_population_list)
+        self.population_cost = self.cost_function(self.population)
+        if self.instrumentation is not None:
+            self.instrumentation.record(
+                "initialization", self.start_time, self.eval_count, self.x_population, 0
+            )
         # Inisialisasi panjang gelombang awal
-        wave_length = np.full(self.x_population, self.lambd)
+        self.wave_length = np.full(self.x_population, self.lambd, dtype=float)
         # Inisialisasi tinggi gelombang awal
-        wave_height = np.full(self.x_population, self.hmax)
+        self.wave_height = np.full(self.x_population, self.hmax)
         # Indexing untuk mencari cost terkecil
-        min_index = np.argmin(wave_population_cost_list)
-        best_pos, best_fit = (
-            wave_population_list[min_index].nurse_second_schedule,
-            wave_population_cost_list[min_index],
+        self.min_index = np.argmin(self.population_cost)
+        self.best_pos, self.best_fit = (
+            self.population[self.min_index].copy(),
+            self.population_cost[self.min_index],
         )
         # Inisialisasi nilai beta (untuk nanti diupdate setiap iterasi secara linear)
-        beta = self.beta_max
+        self.beta = self.beta_max
 
         self.best_fit_iteration = []
-        self.best_fit_iteration.append(wave_population_cost_list[min_index])
-        # Iterasi berdasarkan jumlah iterasi maksimal
-        for iteration in range(self.iteration):
-            # Iterasi untuk tiap gelombang dalam populasi
-            for index, wave in enumerate(wave_population_list):
-                new_pos, new_fit = self.propagation(wave)
-                #print(new_pos,new_fit)
-                if new_fit < wave_population_cost_list[index]:
-                    # new_fit_counter += 1
-                    wave.nurse_second_schedule, wave_population_cost_list[index] = (
-                        new_pos,
-                        new_fit,
+        self.best_fit_iteration.append(self.best_fit)
+
+    def optimize(self) -> tuple:
+        """Fungsi optimasi WWO. Berhenti ketika jumlah iterasi habis atau salah satu
+        budget (time_limit, max_evaluations, target_cost, stall_iterations) tercapai,
+        alasan berhenti disimpan di stop_reason
+
+        Returns:
+            best_pos: Jadwal terbaik yang ditemukan (label shift) (Perawat x Hari)
+            best_fit: Cost jadwal terbaik
+        """
+        for _ in self.iterate():
+            pass
+        return self.shift_label(self.best_pos), self.best_fit
+
+    def iterate(self, initialize: bool = True):
+        """Generator optimasi WWO yang menghasilkan snapshot setiap iterasi, sehingga
+        pemanggil dapat menampilkan progres, memperbarui grafik, atau berhenti lebih
+        awal (cukup berhenti mengambil snapshot, solusi terbaik ada di best_pos dan
+        best_fit)
+
+        Args:
+            initialize: False untuk melanjutkan state yang sudah ada (mis. dari
+                load_checkpoint)
+
+        Yields:
+            snapshot: Dictionary berisi iteration, best_fit, cost (cost tiap wave),
+                eval_count, dan elapsed_time
+        """
+        if initialize:
+            self.initialize()
+        self.last_checkpoint_time = time.perf_counter()
+        while not self.stopping_criteria():
+            self.step()
+            if self.checkpoint_due():
+                self.save_checkpoint(self.checkpoint_path)
+            yield self.snapshot()
+        if self.checkpoint_path is not None:
+            self.save_checkpoint(self.checkpoint_path)
+
+    def resume(self, path: str) -> tuple:
+        """Fungsi untuk melanjutkan optimasi dari checkpoint. Objek WWO dan NSP harus
+        dibuat dengan parameter yang sama dengan run yang disimpan
+
+        Args:
+            path: File checkpoint (.npz)
+
+        Returns:
+            best_pos: Jadwal terbaik yang ditemukan (label shift) (Perawat x Hari)
+            best_fit: Cost jadwal terbaik
+        """
+        self.load_checkpoint(path)
+        for _ in self.iterate(initialize=False):
+            pass
+        return self.shift_label(self.best_pos), self.best_fit
+
+    def checkpoint_due(self) -> bool:
+        """Fungsi untuk mengecek apakah checkpoint perlu disimpan pada iterasi ini"""
+        if self.checkpoint_path is None:
+            return False
+        if self.checkpoint_every is not None and self.iter % self.checkpoint_every == 0:
+            return True
+        return (
+            self.checkpoint_seconds is not None
+            and time.perf_counter() - self.last_checkpoint_time >= self.checkpoint_seconds
+        )
+
+    def save_checkpoint(self, path: str) -> None:
+        """Fungsi untuk menyimpan state optimasi (populasi, panjang dan tinggi
+        gelombang, beta, solusi terbaik, counter, dan state RNG) ke file .npz.
+        File ditulis ke file sementara lalu di-rename agar tidak rusak jika proses
+        berhenti di tengah penyimpanan.
+
+        Args:
+            path: File checkpoint (.npz)
+        """
+        temp_path = f"{path}.tmp.npz"
+        np.savez_compressed(
+            temp_path,
+            population=self.population,
+            population_cost=self.population_cost,
+            wave_length=self.wave_length,
+            wave_height=self.wave_height,
+            beta=self.beta,
+            best_pos=self.best_pos,
+            best_fit=self.best_fit,
+            min_index=self.min_index,
+            iter=self.iter,
+            eval_count=self.eval_count,
+            stall_count=self.stall_count,
+            elapsed_time=self.elapsed_time(),
+            best_fit_iteration=np.asarray(self.best_fit_iteration),
+            rng_state=json.dumps(self.rng.bit_generator.state),
+        )
+        os.replace(temp_path, path)
+        self.last_checkpoint_time = time.perf_counter()
+
+    def load_checkpoint(self, path: str) -> None:
+        """Fungsi untuk memuat state optimasi dari file checkpoint .npz
+
+        Args:
+            path: File checkpoint (.npz)
+        """
+        with np.load(path) as checkpoint:
+            population = checkpoint["population"]
+            if population.shape != (
+                self.x_population,
+                self.NSP.unit_total_nurse * self.NSP.day,
+            ):
+                raise ValueError(
+                    f"Checkpoint {path} tidak sesuai dengan populasi/unit WWO ini"
+                )
+            self.population = population
+            self.workspace = Workspace(*population.shape)
+            self.population_cost = checkpoint["population_cost"]
+            self.wave_length = checkpoint["wave_length"]
+            self.wave_height = checkpoint["wave_height"]
+            self.beta = checkpoint["beta"][()]
+            self.best_pos = checkpoint["best_pos"]
+            self.best_fit = checkpoint["best_fit"][()]
+            self.min_index = checkpoint["min_index"][()]
+            self.iter = int(checkpoint["iter"])
+            self.eval_count = int(checkpoint["eval_count"])
+            self.stall_count = int(checkpoint["stall_count"])
+            self.start_time = time.perf_counter() - float(checkpoint["elapsed_time"])
+            self.best_fit_iteration = list(checkpoint["best_fit_iteration"])
+            self.rng.bit_generator.state = json.loads(str(checkpoint["rng_state"]))
+        self.stop_reason = None
+
+    def snapshot(self) -> dict:
+        """Fungsi untuk membuat ringkasan state optimasi saat ini
+
+        Returns:
+            snapshot: Dictionary berisi iteration, best_fit, cost, eval_count,
+                dan elapsed_time
+        """
+        return {
+            "iteration": self.iter,
+            "best_fit": self.best_fit,
+            "cost": self.population_cost.copy(),
+            "eval_count": self.eval_count,
+            "elapsed_time": self.elapsed_time(),
+        }
+
+    def optimize_vectorized(self) -> tuple:
+        """Fungsi optimasi WWO dengan engine vectorized (lihat step_vectorized)
+
+        Returns:
+            best_pos: Jadwal terbaik (label shift) (Perawat x Hari)
+            best_fit: Cost jadwal terbaik
+        """
+        engine, self.engine = self.engine, "vectorized"
+        try:
+            return self.optimize()
+        finally:
+            self.engine = engine
+
+    def elapsed_time(self) -> float:
+        """Fungsi untuk menghitung lama optimasi berjalan (detik)"""
+        return time.perf_counter() - self.start_time
+
+    def stopping_criteria(self) -> bool:
+        """Fungsi untuk mengecek apakah optimasi harus berhenti
+
+        Returns:
+            stop: True jika iterasi atau salah satu budget habis
+        """
+        if self.iter >= self.iteration:
+            self.stop_reason = "iteration"
+        elif self.time_limit is not None and self.elapsed_time() >= self.time_limit:
+            self.stop_reason = "time_limit"
+        elif self.max_evaluations is not None and self.eval_count >= self.max_evaluations:
+            self.stop_reason = "max_evaluations"
+        elif self.target_cost is not None and self.best_fit <= self.target_cost:
+            self.stop_reason = "target_cost"
+        elif self.stall_iterations is not None and self.stall_count >= self.stall_iterations:
+            self.stop_reason = "stall"
+        else:
+            self.stop_reason = None
+        return self.stop_reason is not None
+
+    def step(self) -> None:
+        """Fungsi untuk menjalankan satu iterasi WWO sesuai engine yang dipilih"""
+        start = self.operator_start()
+        best_fit_old = self.best_fit
+        if self.engine == "vectorized":
+            self.step_vectorized()
+        else:
+            self.step_loop()
+
+        self.min_index, max_index = np.argmin(self.population_cost), np.argmax(
+            self.population_cost)
+        # Wave terbaik yang membaik tanpa breaking tetap tercatat sebagai best
+        if self.population_cost[self.min_index] < self.best_fit:
+            self.best_pos, self.best_fit = (
+                self.population[self.min_index].copy(),
+                self.population_cost[self.min_index],
+            )
+        if self.local_search_mode == "best" and (
+            self.best_fit < best_fit_old or self.iter == 0
+        ):
+            pos, fit = self.local_search(
+                self.population[self.min_index], self.population_cost[self.min_index]
+            )
+            self.population_cost[self.min_index] = fit
+            if fit < self.best_fit:
+                self.best_pos, self.best_fit = pos.copy(), fit
+        self.wave_length = self.update_wave_length(
+            self.wave_length,
+            self.population_cost,
+            self.population_cost[max_index],
+            self.population_cost[self.min_index],
+        )
+
+        self.beta = self.update_beta(self.iter)
+        self.best_fit_iteration.append(self.best_fit)
+        self.stall_count = 0 if self.best_fit < best_fit_old else self.stall_count + 1
+        self.iter += 1
+        if self.instrumentation is not None:
+            self.instrumentation.record_iteration(start[0], self.best_fit < best_fit_old)
+
+    def operator_start(self) -> tuple:
+        """Fungsi untuk mencatat waktu dan jumlah evaluasi sebelum sebuah operator
+        dijalankan (hanya jika instrumentation aktif)
+
+        Returns:
+            start: (waktu mulai, eval_count) atau None
+        """
+        if self.instrumentation is None:
+            return None
+        return time.perf_counter(), self.eval_count
+
+    def operator_end(self, operator: str, start: tuple, attempts, improvements) -> None:
+        """Fungsi untuk mencatat hasil operator yang dimulai dengan operator_start
+
+        Args:
+            operator: Nama operator ("propagation", "breaking", "refraction")
+            start: Hasil operator_start
+            attempts: Jumlah kandidat yang dicoba
+            improvements: Jumlah kandidat yang memperbaiki cost
+        """
+        if start is None:
+            return
+        start_time, start_eval = start
+        self.instrumentation.record(
+            operator, start_time, self.eval_count - start_eval, attempts, improvements
+        )
+
+    def summary(self) -> dict:
+        """Fungsi untuk membuat ringkasan run: hasil optimasi ditambah statistik
+        instrumentation (jika aktif)
+
+        Returns:
+            summary: Dictionary yang dapat diekspor ke JSON
+        """
+        summary = {
+            "units_name": self.NSP.units_name,
+            "iteration": self.iter,
+            "best_fit": float(self.best_fit),
+            "eval_count": self.eval_count,
+            "elapsed_time": self.elapsed_time(),
+            "stop_reason": self.stop_reason,
+        }
+        if self.NSP.cost_cache is not None:
+            summary["cost_cache"] = self.NSP.cache_stats()
+        if self.instrumentation is not None:
+            summary.update(self.instrumentation.summary())
+        return summary
+
+    def step_loop(self) -> None:
+        """Satu iterasi WWO dengan perulangan untuk tiap wave"""
+        population, population_cost = self.population, self.population_cost
+        wave_length, wave_height = self.wave_length, self.wave_height
+        # Propagasi seluruh gelombang lalu dihitung cost-nya sekaligus
+        start = self.operator_start()
+        new_pos_list, new_fit_list = self.propagation_array(
+            population, wave_length, upper_bound=population_cost
+        )
+        self.operator_end(
+            "propagation",
+            start,
+            self.x_population,
+            np.count_nonzero(new_fit_list < population_cost),
+        )
+        # Iterasi untuk tiap gelombang dalam populasi
+        for index in range(self.x_population):
+            new_pos, new_fit = new_pos_list[index], new_fit_list[index]
+            #print(new_pos,new_fit)
+            if new_fit < population_cost[index]:
+                # new_fit_counter += 1
+                if self.local_search_mode == "propagation":
+                    new_pos, new_fit = self.local_search(new_pos, new_fit)
+                wave_height[index] = self.hmax
+                if new_fit < self.best_fit and index != self.min_index:
+                    new_pos, new_fit, wave_length[index] = self.breaking(
+                        new_pos, new_fit, wave_length[index], self.beta, self.NSP
+                    )
+                    self.best_pos, self.best_fit = new_pos.copy(), new_fit
+                population[index], population_cost[index] = new_pos, new_fit
+            else:
+                wave_height[index] -= 1
+                if wave_height[index] == 0:
+                    fit_old = population_cost[index]
+                    start = self.operator_start()
+                    population[index], population_cost[index] = self.refraction(
+                        population[index], self.best_pos, self.NSP
+                    )
+                    self.operator_end(
+                        "refraction", start, 1, population_cost[index] < fit_old
                     )
                     wave_height[index] = self.hmax
-                    if new_fit < best_fit and index != min_index:
-                        new_pos, new_fit, wave_length[index] = self.breaking(
-                            new_pos, new_fit, wave_length[index], beta, wave
-                        )
-                        best_pos, best_fit = new_pos, new_fit
-                else:
-                    wave_height[index] -= 1
-                    if wave_height[index] == 0:
-                        fit_old = wave_population_cost_list[index]
-                        (
-                            wave.nurse_second_schedule,
-                            wave_population_cost_list[index],
-                        ) = self.refraction(wave.nurse_second_schedule, best_pos, wave)
-                        wave_height[index] = self.hmax
-                        wave_length[index] = self.set_wave_length(
-                            wave_length[index],
-                            fit_old,
-                            wave_population_cost_list[index],
-                        )
-            min_index, max_index = np.argmin(wave_population_cost_list), np.argmax(
-                wave_population_cost_list)
-            wave_length = self.update_wave_length(
-                wave_length,
-                wave_population_cost_list,
-                wave_population_cost_list[max_index],
-                wave_population_cost_list[min_index],
-            )
-
-            beta = self.update_beta(iteration)
-            print(
-                 f"""
-                   new fit = {new_fit}
-                   best fit = {best_fit}
-                   """
-            )
-            self.best_fit_iteration.append(best_fit)
-
-        best_pos = best_pos.reshape(self.NSP.unit_total_nurse,self.NSP.day)
-        best_pos = best_pos.astype(int)
-        best_pos = np.where(best_pos.astype(str)=="0","Pagi",best_pos.astype(str))
-        best_pos = np.where(best_pos.astype(str)=="1","Sore",best_pos.astype(str))
-        best_pos = np.where(best_pos.astype(str)=="2","Malam",best_pos.astype(str))
-        best_pos = np.where(best_pos.astype(str)=="3","Libur",best_pos.astype(str))
-        return best_pos, best_fit
-
-    def propagation(self, wave: NSP_Class) -> tuple:
-
-        l = np.abs(self.upper_bound - self.lower_bound)
-        new_pos = (
-            wave.nurse_second_schedule
-            + np.random.uniform(-1, 1, size=wave.nurse_second_schedule.shape)
-            * l
-            * self.lambd
-        )
-        new_pos = self.boundary_handle(new_pos)
-        new_fit = wave.cost(new_pos)
+                    wave_length[index] = self.set_wave_length(
+                        wave_length[index], fit_old, population_cost[index]
+                    )
+
+    def step_vectorized(self) -> None:
+        """Satu iterasi WWO dengan seluruh populasi disimpan dalam satu array
+        (Populasi x Perawat*Hari). Propagasi, pengecekan perbaikan, penurunan tinggi
+        gelombang, dan refraksi dilakukan untuk seluruh wave sekaligus dengan mask,
+        tanpa loop per wave. Breaking hanya untuk wave yang menjadi best baru.
+        """
+        # Propagasi seluruh wave
+        start = self.operator_start()
+        new_pos, new_fit = self.propagation_array(
+            self.population, self.wave_length, upper_bound=self.population_cost
+        )
+        improved = new_fit < self.population_cost
+        self.operator_end(
+            "propagation", start, self.x_population, np.count_nonzero(improved)
+        )
+        if self.local_search_mode == "propagation":
+            for index in np.flatnonzero(improved):
+                new_pos[index], new_fit[index] = self.local_search(
+                    new_pos[index], new_fit[index]
+                )
+        self.population[improved] = new_pos[improved]
+        self.population_cost = np.where(improved, new_fit, self.population_cost)
+        self.wave_height = np.where(improved, self.hmax, self.wave_height - 1)
+
+        # Breaking hanya untuk wave yang menjadi best baru
+        candidate = improved & (new_fit < self.best_fit)
+        candidate[self.min_index] = False
+        if np.any(candidate):
+            index = np.flatnonzero(candidate)[np.argmin(new_fit[candidate])]
+            (
+                self.population[index],
+                self.population_cost[index],
+                self.wave_length[index],
+            ) = self.breaking(
+                self.population[index],
+                self.population_cost[index],
+                self.wave_length[index],
+                self.beta,
+                self.NSP,
+            )
+            self.best_pos = self.population[index].copy()
+            self.best_fit = self.population_cost[index]
+
+        # Refraksi untuk wave yang tinggi gelombangnya habis
+        refract = self.wave_height <= 0
+        if np.any(refract):
+            fit_old = self.population_cost[refract]
+            start = self.operator_start()
+            (
+                self.population[refract],
+                self.population_cost[refract],
+            ) = self.refraction_array(self.population[refract], self.best_pos)
+            self.operator_end(
+                "refraction",
+                start,
+                np.count_nonzero(refract),
+                np.count_nonzero(self.population_cost[refract] < fit_old),
+            )
+            self.wave_height[refract] = self.hmax
+            self.wave_length[refract] = self.set_wave_length(
+                self.wave_length[refract], fit_old, self.population_cost[refract]
+            )
+
+    def shift_label(self, best_pos) -> np.ndarray:
+        """Fungsi untuk mengubah kode shift menjadi label shift
+
+        Args:
+            best_pos: Jadwal berkode 0 1 2 3
+
+        Returns:
+            best_pos: Jadwal berlabel Pagi, Sore, Malam, Libur (Perawat x Hari)
+        """
+        best_pos = np.asarray(best_pos).reshape(self.NSP.unit_total_nurse,self.NSP.day)
+        return shift_label(best_pos)
+
+    def propagation(self, pos) -> tuple:
+        """Fungsi propagasi untuk satu wave
+
+        Returns:
+            new_pos: Posisi baru (array baru, bukan buffer workspace)
+            new_fit: Cost posisi baru
+        """
+        new_pos, new_fit = self.propagation_array(np.asarray(pos)[None])
+        return new_pos[0].copy(), new_fit[0]
+
+    def propagation_array(self, pos, wave_length=None, upper_bound=None) -> tuple:
+        """Fungsi propagasi untuk populasi dalam bentuk array
+
+        Args:
+            pos: Posisi tiap wave (Populasi x Perawat*Hari)
+            wave_length: Panjang gelombang tiap wave (dipakai pada mode discrete)
+            upper_bound: Cost wave saat ini, posisi baru yang pasti tidak lebih baik
+                tidak dihitung penuh (lihat NSP_Class.bounded_cost_batch)
+
+        Returns:
+            new_pos: Posisi baru tiap wave (Populasi x Perawat*Hari), buffer workspace
+                yang ditimpa pada pemanggilan propagation_array berikutnya
+            new_fit: Cost posisi baru tiap wave (Populasi)
+        """
+        if self.mode == "discrete":
+            if wave_length is None:
+                wave_length = np.full(pos.shape[0], self.lambd)
+            new_pos = self.discrete_propagation(pos, wave_length)
+        else:
+            l = np.abs(self.upper_bound - self.lower_bound)
+            new_pos = self.workspace.buffer("propagation", pos.shape)
+            # Blok bilangan acak uniform(-1, 1) langsung ditulis ke buffer
+            self.rng.random(out=new_pos)
+            np.multiply(new_pos, 2 * l * self.lambd, out=new_pos)
+            np.subtract(new_pos, l * self.lambd, out=new_pos)
+            np.add(pos, new_pos, out=new_pos)
+            self.boundary_handle(new_pos, out=new_pos)
+        new_fit = self.evaluate(new_pos, upper_bound=upper_bound)
         return new_pos, new_fit
 
-    def boundary_handle(self, new_pos) -> np.ndarray:
+    def discrete_propagation(self, pos, wave_length) -> np.ndarray:
+        """Fungsi propagasi mode discrete, tiap wave mengganti shift dari
+        ceil(wave_length * k_max) sel acak menjadi shift lain
+
+        Args:
+            pos: Kode shift tiap wave (Populasi x Perawat*Hari)
+            wave_length: Panjang gelombang tiap wave (Populasi)
+
+        Returns:
+            new_pos: Kode shift baru tiap wave (Populasi x Perawat*Hari)
+        """
+        new_pos = self.workspace.buffer("propagation_code", pos.shape, np.uint8)
+        if pos.dtype == np.uint8:
+            np.minimum(pos, 4, out=new_pos)
+        else:
+            new_pos[...] = to_shift_code(pos)
+        total_cell = new_pos.shape[1]
+        total_change = np.clip(
+            np.ceil(np.asarray(wave_length) * self.k_max), 1, total_cell
+        ).astype(int)
+        # Tiap wave mengambil total_change[wave] sel dari max(total_change) sel acak
+        cell = self.rng.integers(total_cell, size=(new_pos.shape[0], total_change.max()))
+        wave = np.broadcast_to(np.arange(new_pos.shape[0])[:, None], cell.shape)
+        mask = np.arange(cell.shape[1]) < total_change[:, None]
+        wave, cell = wave[mask], cell[mask]
+        # Ditambah 1-3 (mod 4) agar shift pasti berubah
+        new_pos[wave, cell] = (new_pos[wave, cell] + self.rng.integers(1, 4, size=cell.shape)) % 4
+        return new_pos
+
+    def boundary_handle(self, new_pos, out=None) -> np.ndarray:
         """Fungsi untuk menghandle nilai yang melewati batas
 
         Args:
             new_pos: np.ndarray
+            out: Array tujuan (boleh new_pos sendiri), None = array baru
 
         Returns:
             new_pos: np.ndarray
         """
-        new_pos = np.where(
-            np.logical_or(new_pos > self.upper_bound, new_pos < self.lower_bound),
-            np.random.uniform(self.lower_bound, self.upper_bound),
-            new_pos,
+        if out is None:
+            out = np.empty_like(new_pos)
+        outside = self.workspace.buffer("outside", new_pos.shape, np.bool_)
+        below = self.workspace.buffer("below", new_pos.shape, np.bool_)
+        np.greater(new_pos, self.upper_bound, out=outside)
+        np.less(new_pos, self.lower_bound, out=below)
+        np.logical_or(outside, below, out=outside)
+        if out is not new_pos:
+            np.copyto(out, new_pos)
+        np.copyto(
+            out,
+            self.rng.uniform(self.lower_bound, self.upper_bound),
+            where=outside,
         )
-
-        return new_pos
+        return out
 
     def breaking(self, new_pos, new_fit, wave_length, beta, wave) -> tuple:
-        print("breaking")
-        k = np.random.randint(1, self.k_max)
-        temp = np.random.permutation(new_pos.shape[0])[:k]
-        for i in range(k):
-            temp_pos = new_pos.copy()
-            d = temp[i]
-            temp_pos[d] = new_pos[d] + np.random.normal(0, 1) * beta * np.fabs(
+        start = self.operator_start()
+        k = self.rng.integers(1, self.k_max)
+        temp = self.rng.choice(new_pos.shape[0], size=k, replace=False)
+        nurses, days = np.divmod(temp, wave.day)
+        if self.mode == "discrete":
+            # Mode discrete: sel diganti menjadi shift lain
+            temp_value = (new_pos[temp].astype(int) + self.rng.integers(1, 4, size=k)) % 4
+        else:
+            temp_value = new_pos[temp] + self.rng.standard_normal(k) * beta * np.fabs(
                 self.upper_bound - self.lower_bound
             )
-            self.boundary_handle(temp_pos)
-            temp_fit = wave.cost(temp_pos)
+        # Seluruh k tetangga dinilai sekaligus dengan delta terhadap jadwal awal
+        delta_cost = wave.delta_state(new_pos)
+        temp_breakdown = delta_cost.delta_breakdown_batch(nurses, days, temp_value)
+        temp_delta = wave.total_cost(temp_breakdown)
+        self.eval_count += k
+
+        # Perubahan diterapkan berurutan, delta dihitung ulang hanya jika sel berada
+        # di hari yang sama atau dalam jangkauan aturan transisi/jendela sel yang
+        # sudah diubah
+        reach = wave.rule_span - 1
+        applied = []
+        for i in range(k):
+            nurse, day = nurses[i], days[i]
+            if any(
+                day == applied_day
+                or (nurse == applied_nurse and abs(day - applied_day) <= reach)
+                for applied_nurse, applied_day in applied
+            ):
+                delta_breakdown = delta_cost.delta_breakdown(nurse, day, temp_value[i])
+                temp_fit = new_fit + wave.total_cost(delta_breakdown)
+            else:
+                delta_breakdown = temp_breakdown[i]
+                temp_fit = new_fit + temp_delta[i]
 
             if temp_fit < new_fit:
-                new_pos[d] = temp_pos[d]
+                new_pos[temp[i]] = temp_value[i]
+                delta_cost.apply(nurse, day, temp_value[i], delta_breakdown)
+                applied.append((nurse, day))
                 wave_length = self.set_wave_length(wave_length, new_fit, temp_fit)
                 new_fit = temp_fit
+        self.operator_end("breaking", start, k, len(applied))
         return new_pos, new_fit, wave_length
 
+    def local_search(self, pos, fit) -> tuple:
+        """Local search pertukaran shift dua perawat pada hari yang sama. Pertukaran
+        tidak mengubah jumlah shift per hari (hard constraint minimum shift tetap),
+        delta cost hanya dihitung dari aturan transisi dan jendela di hari-hari
+        sekitarnya.
+        Setiap hari seluruh pasangan perawat dinilai sekaligus (swap_delta_matrix)
+        dan pertukaran yang menurunkan cost diterapkan, diulang hingga tidak ada
+        perbaikan atau local_search_passes habis. Setiap hari yang dinilai dihitung
+        sebagai satu evaluasi.
+
+        Args:
+            pos: Posisi wave (Perawat*Hari), diubah langsung
+            fit: Cost posisi wave
+
+        Returns:
+            pos: Posisi wave setelah local search
+            fit: Cost posisi wave setelah local search
+        """
+        start = self.operator_start()
+        total_day = self.NSP.day
+        delta_cost = self.NSP.delta_state(pos)
+        scanned, swapped = 0, 0
+        for _ in range(self.local_search_passes):
+            improved = 0
+            for day in self.rng.permutation(total_day):
+                for nurse_a, nurse_b in delta_cost.improving_swaps(day):
+                    delta_cost.apply_swap(nurse_a, nurse_b, day)
+                    cell_a, cell_b = nurse_a * total_day + day, nurse_b * total_day + day
+                    pos[cell_a], pos[cell_b] = pos[cell_b], pos[cell_a]
+                    improved += 1
+            scanned += total_day
+            swapped += improved
+            if not improved:
+                break
+        self.eval_count += scanned
+        self.operator_end("local_search", start, scanned, swapped)
+        if swapped:
+            fit = delta_cost.cost
+        return pos, fit
+
     def set_wave_length(self, wave_length, fit_old, fit) -> float:
         return wave_length * fit_old / (fit + self.epsilon)
 
     def refraction(self, pos, best_pos, wave):
-        # print("refract")
-        mu = (best_pos + pos) / 2
-        sigma = np.fabs(best_pos - pos) / 2
-        new_pos = np.random.normal(mu, sigma, size=pos.shape)
-        new_pos = self.boundary_handle(new_pos)
-        new_fit = wave.cost(new_pos)
+        """Fungsi refraksi untuk satu wave
+
+        Returns:
+            new_pos: Posisi baru (array baru, bukan buffer workspace)
+            new_fit: Cost posisi baru
+        """
+        new_pos, new_fit = self.refraction_array(np.asarray(pos)[None], best_pos)
+        return new_pos[0].copy(), new_fit[0]
+
+    def refraction_array(self, pos, best_pos) -> tuple:
+        """Fungsi refraksi untuk beberapa wave sekaligus
+
+        Args:
+            pos: Posisi wave yang direfraksi (Jumlah wave x Perawat*Hari)
+            best_pos: Posisi terbaik
+
+        Returns:
+            new_pos: Posisi baru tiap wave, buffer workspace yang ditimpa pada
+                pemanggilan refraction_array berikutnya
+            new_fit: Cost posisi baru tiap wave
+        """
+        if self.mode == "discrete":
+            pos, best_pos = to_shift_code(pos), to_shift_code(best_pos)
+            pull = self.workspace.buffer("pull", pos.shape, np.bool_)
+            coin = self.workspace.buffer("coin", pos.shape, np.bool_)
+            np.not_equal(pos, best_pos, out=pull)
+            random = self.workspace.buffer("random", pos.shape)
+            np.less(self.rng.random(out=random), 0.5, out=coin)
+            np.logical_and(pull, coin, out=pull)
+            new_pos = self.workspace.buffer("refraction_code", pos.shape, np.uint8)
+            np.copyto(new_pos, pos)
+            np.copyto(new_pos, np.broadcast_to(best_pos, pos.shape), where=pull)
+        else:
+            mu = self.workspace.buffer("mu", pos.shape)
+            sigma = self.workspace.buffer("sigma", pos.shape)
+            np.add(best_pos, pos, out=mu)
+            np.divide(mu, 2, out=mu)
+            np.subtract(best_pos, pos, out=sigma)
+            np.fabs(sigma, out=sigma)
+            np.divide(sigma, 2, out=sigma)
+            # normal(mu, sigma) = mu + sigma * standard_normal, ditulis ke buffer
+            new_pos = self.workspace.buffer("refraction", pos.shape)
+            self.rng.standard_normal(out=new_pos)
+            np.multiply(new_pos, sigma, out=new_pos)
+            np.add(new_pos, mu, out=new_pos)
+            self.boundary_handle(new_pos, out=new_pos)
+        new_fit = self.evaluate(new_pos)
         return new_pos, new_fit
 
     def update_wave_length(self, wave_length, wave_cost_list, max_cost, min_cost):
@@ -653,3 +3194,220 @@ class WWO:
 
     def update_beta(self, index):
         return self.beta_max - (self.beta_max - self.beta_min) * index / self.iteration
+
+
+class IslandWWO:
+    def __init__(
+        self,
+        NSP: NSP_Class,
+        islands: int,
+        migration_interval: int,
+        topology: str = "ring",
+        workers: int = None,
+        seed: int = None,
+        **wwo_params,
+    ) -> None:
+        """Inisialisasi WWO model pulau (island model). Setiap pulau adalah populasi
+        WWO tersendiri yang berjalan di proses terpisah dengan stream RNG independen,
+        dan setiap migration_interval iterasi jadwal terbaik tiap pulau dikirim ke
+        pulau lain untuk menggantikan wave terburuknya.
+
+        Args:
+            NSP: Model NSP yang dioptimasi
+            islands: Jumlah pulau (populasi WWO)
+            migration_interval: Jumlah iterasi antar migrasi
+            topology: "ring" (pulau i menerima dari pulau i-1) atau "full" (setiap
+                pulau menerima jadwal terbaik dari seluruh pulau lain)
+            workers: Jumlah proses paralel (None = satu proses per pulau, 1 = serial)
+            seed: Seed untuk stream RNG tiap pulau
+            **wwo_params: Parameter WWO untuk setiap pulau (iteration, hmax, ...)
+        """
+        if topology not in ("ring", "full"):
+            raise ValueError(f"Topologi migrasi tidak dikenal: {topology}")
+        self.NSP = NSP
+        self.migration_interval = migration_interval
+        self.topology = topology
+        self.workers = islands if workers is None else workers
+        # Stream RNG independen untuk tiap pulau
+        self.islands = [
+            WWO(NSP, seed=seed_sequence, **wwo_params)
+            for seed_sequence in np.random.SeedSequence(seed).spawn(islands)
+        ]
+
+    def optimize(self) -> tuple:
+        """Fungsi optimasi WWO model pulau. Berhenti ketika seluruh pulau berhenti
+        (iterasi atau budget habis) atau salah satu pulau mencapai target_cost.
+        Riwayat konvergensi tiap pulau disimpan di island_histories dan riwayat
+        global di best_fit_iteration.
+
+        Returns:
+            best_pos: Jadwal terbaik dari seluruh pulau (label shift) (Perawat x Hari)
+            best_fit: Cost jadwal terbaik
+        """
+        executor = None
+        if self.workers > 1:
+            executor = ProcessPoolExecutor(max_workers=self.workers)
+        try:
+            while True:
+                active = [
+                    index
+                    for index, island in enumerate(self.islands)
+                    if not hasattr(island, "population") or island.stop_reason is None
+                ]
+                if not active:
+                    break
+                self.run_epoch(active, executor)
+                if any(island.stop_reason == "target_cost" for island in self.islands):
+                    break
+                self.migrate()
+        finally:
+            if executor is not None:
+                executor.shutdown()
+
+        best_island = min(self.islands, key=lambda island: island.best_fit)
+        self.best_pos, self.best_fit = best_island.best_pos, best_island.best_fit
+        self.island_histories = [
+            list(island.best_fit_iteration) for island in self.islands
+        ]
+        # Riwayat global adalah cost terbaik dari seluruh pulau di tiap iterasi
+        length = max(len(history) for history in self.island_histories)
+        self.best_fit_iteration = list(
+            np.min(
+                [
+                    history + history[-1:] * (length - len(history))
+                    for history in self.island_histories
+                ],
+                axis=0,
+            )
+        )
+        return best_island.shift_label(self.best_pos), self.best_fit
+
+    def run_epoch(self, active: list, executor) -> None:
+        """Fungsi untuk menjalankan migration_interval iterasi pada pulau yang masih
+        aktif (paralel jika executor tersedia)
+
+        Args:
+            active: Index pulau yang masih berjalan
+            executor: ProcessPoolExecutor atau None (serial)
+        """
+        islands = [self.islands[index] for index in active]
+        if executor is None:
+            results = [_island_epoch(island, self.migration_interval) for island in islands]
+        else:
+            results = list(
+                executor.map(
+                    _island_epoch, islands, [self.migration_interval] * len(islands)
+                )
+            )
+        for index, island in zip(active, results):
+            self.islands[index] = island
+
+    def migrate(self) -> None:
+        """Fungsi migrasi: jadwal terbaik pulau sumber menggantikan wave terburuk
+        pulau tujuan jika lebih baik
+        """
+        migrants = [
+            (island.best_pos.copy(), island.best_fit) for island in self.islands
+        ]
+        total = len(self.islands)
+        for index, island in enumerate(self.islands):
+            if island.stop_reason is not None or total < 2:
+                continue
+            if self.topology == "ring":
+                migrant_pos, migrant_fit = migrants[index - 1]
+            else:
+                migrant_pos, migrant_fit = min(
+                    (migrant for source, migrant in enumerate(migrants) if source != index),
+                    key=lambda migrant: migrant[1],
+                )
+            worst = np.argmax(island.population_cost)
+            if migrant_fit >= island.population_cost[worst]:
+                continue
+            island.population[worst] = migrant_pos
+            island.population_cost[worst] = migrant_fit
+            island.wave_height[worst] = island.hmax
+            island.wave_length[worst] = island.lambd
+            if migrant_fit < island.best_fit:
+                island.best_pos, island.best_fit = migrant_pos.copy(), migrant_fit
+            island.min_index = np.argmin(island.population_cost)
+
+
+def optimize_units(
+    unit_configs: list,
+    params: dict,
+    workers: int = None,
+    seed=None,
+    progress=None,
+    poll_interval: float = 0.2,
+):
+    """Fungsi untuk mengoptimasi beberapa unit yang saling independen secara paralel.
+    Tiap unit dibangun menjadi NSP_Class dan WWO di proses tersendiri, unit terbesar
+    (Perawat x Hari) dijadwalkan lebih dulu agar total waktu mendekati unit paling
+    lama. Hasil dikembalikan satu per satu begitu unit selesai.
+
+    Jika progress diberikan, worker mengirim snapshot WWO.iterate tiap iterasi lewat
+    multiprocessing.Manager().Queue(), dan progress(units_name, snapshot) dipanggil
+    di proses pemanggil (mis. untuk memperbarui grafik konvergensi secara live).
+
+    Args:
+        unit_configs: List parameter NSP_Class tiap unit (day, units_name,
+            unit_total_nurse, unit_minimum_shift, ...)
+        params: Parameter WWO yang sama untuk semua unit (iteration, hmax, ...)
+        workers: Jumlah proses paralel (None = satu proses per unit, dibatasi jumlah
+            CPU, 1 = serial di proses ini)
+        seed: Seed untuk stream RNG tiap unit
+        progress: Callback progress(units_name, snapshot) tiap iterasi, None = tanpa
+            progress
+        poll_interval: Selang waktu (detik) pengecekan queue progress
+
+    Yields:
+        result: Dictionary berisi units_name, first_schedule (jadwal awal, label
+            shift), best_pos (label shift), best_fit, best_fit_iteration,
+            stop_reason, eval_count, dan elapsed_time
+    """
+    seeds = np.random.SeedSequence(seed).spawn(len(unit_configs))
+    order = sorted(
+        range(len(unit_configs)),
+        key=lambda index: unit_configs[index]["unit_total_nurse"]
+        * unit_configs[index]["day"],
+        reverse=True,
+    )
+    if workers is None:
+        workers = min(len(unit_configs), os.cpu_count() or 1)
+    if workers <= 1:
+        for index in order:
+            yield _optimize_unit(unit_configs[index], params, seeds[index], progress)
+        return
+    if progress is None:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = [
+                executor.submit(
+                    _optimize_unit, unit_configs[index], params, seeds[index]
+                )
+                for index in order
+            ]
+            for future in as_completed(futures):
+                yield future.result()
+        return
+    with Manager() as manager, ProcessPoolExecutor(max_workers=workers) as executor:
+        queue = manager.Queue()
+        pending = {
+            executor.submit(
+                _optimize_unit,
+                unit_configs[index],
+                params,
+                seeds[index],
+                partial(_put_progress, queue),
+            )
+            for index in order
+        }
+        while pending:
+            done, pending = wait(
+                pending, timeout=poll_interval, return_when=FIRST_COMPLETED
+            )
+            # Snapshot diteruskan sebelum hasil, sehingga snapshot terakhir unit yang
+            # selesai sudah diterima
+            while not queue.empty():
+                progress(*queue.get())
+            for future in done:
+                yield future.result()
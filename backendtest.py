@@ -330,7 +330,6 @@ class NSP_Class:
             np.where(array_difference[:, :3] < 0, array_difference[:, :3], 0)
         )
         cost_minimum_shift = -check_if_not_minimal
-        print(f'''minimal terpenuhi = {cost_minimum_shift}''')
         return cost_minimum_shift
 
     def hard_constraint_cost_one_per_day(self, nurse_array) -> int:
@@ -369,7 +368,6 @@ class NSP_Class:
         where_night_plus = np.delete(where_night_plus,(where_more_than_max*2,where_more_than_max*2+1)).reshape(-1,2,)
         nurse_array_plus = nurse_array[where_night_plus[:,0],where_night_plus[:,1]]
         cost_night_day = np.sum(np.where(nurse_array_plus==0,1,0))
-        print(f'''malam ke pagi = {cost_night_day}''')
         return cost_night_day
 
     def soft_constraint_cost_noon_shift(self, nurse_array) -> int:
@@ -393,7 +391,6 @@ class NSP_Class:
         where_noon_plus = np.delete(where_noon_plus,(where_more_than_max*2,where_more_than_max*2+1)).reshape(-1,2,)
         nurse_array_plus = nurse_array[where_noon_plus[:,0],where_noon_plus[:,1]]
         cost_noon_shift = np.sum(np.where(nurse_array_plus==0,1,0))
-        print(f'''siang ke pagi = {cost_noon_shift}''')
         return cost_noon_shift
 
     def soft_constraint_cost_morning_shift(self, nurse_array) -> int:
@@ -416,7 +413,6 @@ class NSP_Class:
         where_morning_plus = np.delete(where_morning_plus,(where_more_than_max*2,where_more_than_max*2+1)).reshape(-1,2,)
         nurse_array_plus = nurse_array[where_morning_plus[:,0],where_morning_plus[:,1]]
         cost_morning_shift = np.sum(np.where(nurse_array_plus==2,1,0))
-        print(f'''pagi ke malam = {cost_morning_shift}''')
         return cost_morning_shift
 
     def soft_constraint_cost_night_holiday_noon(self, nurse_array) -> int:
@@ -592,14 +588,6 @@ class WWO:
             )
 
             beta = self.update_beta(iteration)
-            print(
-                f"""
-                  Best fit = {new_pos}
-                  New Fit = {best_pos}
-                  Best fit xxx= {min(new_pos)}
-                  New Fit xxx= {max(best_pos)}
-                  """
-            )
             self.best_fit_iteration.append(best_fit)
             self.best_fit_iteration.append(new_fit)
         # best_pos = best_pos.reshape(-1, 4)
@@ -644,7 +632,6 @@ class WWO:
         return new_pos
 
     def breaking(self, new_pos, new_fit, wave_length, beta, wave) -> tuple:
-        print("breaking")
         k = np.random.randint(1, self.k_max)
         temp = np.random.permutation(new_pos.shape[0])[:k]
         for i in range(k):
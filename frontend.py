@@ -1,6 +1,6 @@
 import os
 import numpy as np
-from backend import NSP_Class, WWO
+from backend import optimize_units
 import streamlit as st
 import altair as alt
 import pandas as pd
@@ -90,6 +90,41 @@ class Main:
             if st.form_submit_button("Optimize"):
                 st.session_state["optimize"] = True
 
+    def plot_convergence(self, best_fit_iteration, column, plot):
+        data = pd.DataFrame(
+            {
+                column: best_fit_iteration,
+                "Iteration": np.arange(len(best_fit_iteration)),
+            }
+        )
+        chart = alt.Chart(data).mark_line().encode(x="Iteration", y=column)
+        plot.altair_chart(chart, use_container_width=True)
+
+    def progress_callback(self, placeholders):
+        """Membuat callback optimize_units yang memperbarui grafik konvergensi unit
+        setiap iterasi"""
+        histories = {unit: [] for unit in placeholders}
+        last_update = {}
+
+        def progress(unit, snapshot):
+            histories[unit].append(snapshot["best_fit"])
+            # Grafik diperbarui paling sering tiap 0.5 detik per unit
+            if unit in last_update and snapshot["elapsed_time"] - last_update[unit] < 0.5:
+                return
+            last_update[unit] = snapshot["elapsed_time"]
+            self.plot_convergence(
+                histories[unit], f"Cost Jadwal 2 Unit {unit}", placeholders[unit][2]
+            )
+
+        return progress
+
+    def schedule_dataframe(self, schedule):
+        return pd.DataFrame(
+            schedule,
+            index=["Perawat " + str(i) for i in np.arange(1, schedule.shape[0] + 1)],
+            columns=["Hari " + str(i) for i in np.arange(1, schedule.shape[1] + 1)],
+        )
+
     def output(self):
         st.title("Optimizing Nurse Scheduling Problem with Water Wave Optimization")
         units_name = ["IGD", "Rawat Inap", "Anastesi", "ICU", "OK"]
@@ -112,334 +147,58 @@ class Main:
                 )
 
         if st.session_state["optimize"]:
-            NSP_Class_Dict = {}
-            for index, unit in enumerate(units_name):
-                NSP_Class_Dict[unit] = NSP_Class(
-                    day=30,
-                    units_name=unit,
-                    unit_total_nurse=units_nurse_num[index],
-                    unit_minimum_shift=units_minimum_shift[index, :],
-                    hard_constraint_multiplier=st.session_state["multiplier"],
-                    soft_constraint_multiplier=st.session_state["softmultiplier"],
-                )
-            cols2 = st.columns(3)
-            with cols2[0]:
-                st.subheader("IGD")
-                st.dataframe(
-                    pd.DataFrame(
-                        NSP_Class_Dict["IGD"].nurse_array_col,
-                        index=[
-                            "Perawat " + str(i)
-                            for i in np.arange(
-                                1, NSP_Class_Dict["IGD"].nurse_array_col.shape[0] + 1
-                            )
-                        ],
-                        columns=[
-                            "Hari " + str(i)
-                            for i in np.arange(
-                                1, NSP_Class_Dict["IGD"].nurse_array_col.shape[1] + 1
-                            )
-                        ],
-                    )
-                )
-                st.subheader("Rawat Inap")
-                st.dataframe(
-                    pd.DataFrame(
-                        NSP_Class_Dict["Rawat Inap"].nurse_array_col,
-                        index=[
-                            "Perawat " + str(i)
-                            for i in np.arange(
-                                1,
-                                NSP_Class_Dict["Rawat Inap"].nurse_array_col.shape[0]
-                                + 1,
-                            )
-                        ],
-                        columns=[
-                            "Hari " + str(i)
-                            for i in np.arange(
-                                1,
-                                NSP_Class_Dict["Rawat Inap"].nurse_array_col.shape[1]
-                                + 1,
-                            )
-                        ],
-                    )
-                )
-                st.subheader("Anastesi")
-                st.dataframe(
-                    pd.DataFrame(
-                        NSP_Class_Dict["Anastesi"].nurse_array_col,
-                        index=[
-                            "Perawat " + str(i)
-                            for i in np.arange(
-                                1,
-                                NSP_Class_Dict["Anastesi"].nurse_array_col.shape[0] + 1,
-                            )
-                        ],
-                        columns=[
-                            "Hari " + str(i)
-                            for i in np.arange(
-                                1,
-                                NSP_Class_Dict["Anastesi"].nurse_array_col.shape[1] + 1,
-                            )
-                        ],
-                    )
-                )
-                st.subheader("ICU")
-                st.dataframe(
-                    pd.DataFrame(
-                        NSP_Class_Dict["ICU"].nurse_array_col,
-                        index=[
-                            "Perawat " + str(i)
-                            for i in np.arange(
-                                1, NSP_Class_Dict["ICU"].nurse_array_col.shape[0] + 1
-                            )
-                        ],
-                        columns=[
-                            "Hari " + str(i)
-                            for i in np.arange(
-                                1, NSP_Class_Dict["ICU"].nurse_array_col.shape[1] + 1
-                            )
-                        ],
-                    )
-                )
-                st.subheader("OK")
-                st.dataframe(
-                    pd.DataFrame(
-                        NSP_Class_Dict["OK"].nurse_array_col,
-                        index=[
-                            "Perawat " + str(i)
-                            for i in np.arange(
-                                1, NSP_Class_Dict["OK"].nurse_array_col.shape[0] + 1
-                            )
-                        ],
-                        columns=[
-                            "Hari " + str(i)
-                            for i in np.arange(
-                                1, NSP_Class_Dict["OK"].nurse_array_col.shape[1] + 1
-                            )
-                        ],
-                    )
-                )
+            unit_configs = [
+                {
+                    "day": 30,
+                    "units_name": unit,
+                    "unit_total_nurse": units_nurse_num[index],
+                    "unit_minimum_shift": units_minimum_shift[index, :],
+                    "hard_constraint_multiplier": st.session_state["multiplier"],
+                    "soft_constraint_multiplier": st.session_state["softmultiplier"],
+                }
+                for index, unit in enumerate(units_name)
+            ]
+            params = {
+                "iteration": st.session_state["iter"],
+                "hmax": st.session_state["hmax"],
+                "lambd": st.session_state["lambd"],
+                "alpha": st.session_state["alpha"],
+                "epsilon": st.session_state["epsilon"],
+                "beta_max": st.session_state["beta_max"],
+                "beta_min": st.session_state["beta_min"],
+                "k_max": st.session_state["k_max"],
+                "upper_bound": st.session_state["upper_bound"],
+                "lower_bound": st.session_state["lower_bound"],
+                "x_population": st.session_state["x_population"],
+            }
 
-            with cols2[1]:
-                igd_plot_text = st.empty()
-                igd_plot = st.empty()
-                r_inap_plot_text = st.empty()
-                r_inap_plot = st.empty()
-                anastesi_plot_text = st.empty()
-                anastesi_plot = st.empty()
-                icu_plot_text = st.empty()
-                icu_plot = st.empty()
-                ok_plot_text = st.empty()
-                ok_plot = st.empty()
-
-            with cols2[2]:
-                igd_cost_text = st.empty()
-                igd_2 = st.empty()
-                r_inap_cost_text = st.empty()
-                r_inap_2 = st.empty()
-                anastesi_cost_text = st.empty()
-                anastesi_2 = st.empty()
-                icu_cost_text = st.empty()
-                icu_2 = st.empty()
-                ok_cost_text = st.empty()
-                ok_2 = st.empty()
+            # Placeholder tiap unit: jadwal awal, grafik WWO, dan jadwal hasil WWO
+            cols2 = st.columns(3)
+            placeholders = {}
+            for unit in units_name:
+                with cols2[0]:
+                    first_text, first = st.empty(), st.empty()
+                with cols2[1]:
+                    plot_text, plot = st.empty(), st.empty()
+                with cols2[2]:
+                    cost_text, schedule = st.empty(), st.empty()
+                plot_text.subheader(f"{unit} WWO Plot")
+                plot.info(f"Processing {unit} Schedule...")
+                placeholders[unit] = (first_text, first, plot, cost_text, schedule)
 
-            WWO_Class_Dict = {}
-            for index, unit_name in enumerate(units_name):
-                WWO_Class_Dict[unit_name] = WWO(
-                    NSP=NSP_Class_Dict[unit_name],
-                    iteration=st.session_state["iter"],
-                    hmax=st.session_state["hmax"],
-                    lambd=st.session_state["lambd"],
-                    alpha=st.session_state["alpha"],
-                    epsilon=st.session_state["epsilon"],
-                    beta_max=st.session_state["beta_max"],
-                    beta_min=st.session_state["beta_min"],
-                    k_max=st.session_state["k_max"],
-                    upper_bound=st.session_state["upper_bound"],
-                    lower_bound=st.session_state["lower_bound"],
-                    x_population=st.session_state["x_population"],
+            # Seluruh unit dioptimasi paralel, grafik konvergensi diperbarui tiap
+            # iterasi dan hasil ditampilkan begitu unit selesai
+            progress = self.progress_callback(placeholders)
+            for result in optimize_units(unit_configs, params, progress=progress):
+                unit = result["units_name"]
+                first_text, first, plot, cost_text, schedule = placeholders[unit]
+                first_text.subheader(unit)
+                first.dataframe(self.schedule_dataframe(result["first_schedule"]))
+                self.plot_convergence(
+                    result["best_fit_iteration"], f"Cost Jadwal 2 Unit {unit}", plot
                 )
-            with cols2[1]:
-                with st.spinner("Processing IGD Schedule..."):
-                    igd_pos, _ = WWO_Class_Dict["IGD"].optimize()
-                    '''
-                    igd_plot_text.subheader("IGD WWO Plot")
-                    data_igd = pd.DataFrame(
-                        {
-                            "Cost Jadwal 2 Unit IGD": WWO_Class_Dict[
-                                "IGD"
-                            ].best_fit_iteration,
-                            "Iteration": np.arange(st.session_state["iter"] + 1),
-                        }
-                    )
-                    chart_igd = (
-                        alt.Chart(data_igd)
-                        .mark_line()
-                        .encode(x="Iteration", y="Cost Jadwal 2 Unit IGD")
-                    )
-                    igd_plot.altair_chart(chart_igd, use_container_width=True)
-                    '''
-
-                    igd_cost_text.subheader("IGD With WWO"
-                        #f"""Cost {max(WWO_Class_Dict["IGD"].best_fit_iteration)} -> {min(WWO_Class_Dict["IGD"].best_fit_iteration)}"""
-                    )
-                    igd_2.dataframe(
-                        pd.DataFrame(
-                            igd_pos,
-                            index=[
-                                "Perawat " + str(i)
-                                for i in np.arange(1, igd_pos.shape[0] + 1)
-                            ],
-                            columns=[
-                                "Hari " + str(i)
-                                for i in np.arange(1, igd_pos.shape[1] + 1)
-                            ],
-                        )
-                    )
-                # st.success()
-
-                with st.spinner("Processing Rawat Inap Schedule..."):
-                    r_inap_pos, _ = WWO_Class_Dict["Rawat Inap"].optimize()
-                    '''
-                    r_inap_plot_text.subheader("Rawat Inap WWO Plot")
-                    data_r_inap = pd.DataFrame(
-                        {
-                            "Cost Jadwal 2 Unit Rawat Inap": WWO_Class_Dict[
-                                "Rawat Inap"
-                            ].best_fit_iteration,
-                            "Iteration": np.arange(st.session_state["iter"] + 1),
-                        }
-                    )
-                    chart_r_inap = (
-                        alt.Chart(data_r_inap)
-                        .mark_line()
-                        .encode(x="Iteration", y="Cost Jadwal 2 Unit Rawat Inap")
-                    )
-                    r_inap_plot.altair_chart(chart_r_inap, use_container_width=True)
-                    '''
-                    r_inap_cost_text.subheader("Rawat Inap With WWO"
-                        #f"""Cost {max(WWO_Class_Dict["Rawat Inap"].best_fit_iteration)} -> {min(WWO_Class_Dict["Rawat Inap"].best_fit_iteration)}"""
-                    )
-                    r_inap_2.dataframe(
-                        pd.DataFrame(
-                            r_inap_pos,
-                            index=[
-                                "Perawat " + str(i)
-                                for i in np.arange(1, r_inap_pos.shape[0] + 1)
-                            ],
-                            columns=[
-                                "Hari " + str(i)
-                                for i in np.arange(1, r_inap_pos.shape[1] + 1)
-                            ],
-                        )
-                    )
-                with st.spinner("Processing Anastesi Schedule..."):
-                    anastesi_pos, _ = WWO_Class_Dict["Anastesi"].optimize()
-                    '''
-                    anastesi_plot_text.subheader("Anastesi WWO Plot")
-                    data_anastesi = pd.DataFrame(
-                        {
-                            "Cost Jadwal 2 Unit Anastesi": WWO_Class_Dict[
-                                "Anastesi"
-                            ].best_fit_iteration,
-                            "Iteration": np.arange(st.session_state["iter"] + 1),
-                        }
-                    )
-                    chart_anastesi = (
-                        alt.Chart(data_anastesi)
-                        .mark_line()
-                        .encode(x="Iteration", y="Cost Jadwal 2 Unit Anastesi")
-                    )
-                    anastesi_plot.altair_chart(chart_anastesi, use_container_width=True)
-                    '''
-                    anastesi_cost_text.subheader("Anastesi With WWO"
-                        #f"""Cost {max(WWO_Class_Dict["Anastesi"].best_fit_iteration)} -> {min(WWO_Class_Dict["Anastesi"].best_fit_iteration)}"""
-                    )
-                    anastesi_2.dataframe(
-                        pd.DataFrame(
-                            anastesi_pos,
-                            index=[
-                                "Perawat " + str(i)
-                                for i in np.arange(1, anastesi_pos.shape[0] + 1)
-                            ],
-                            columns=[
-                                "Hari " + str(i)
-                                for i in np.arange(1, anastesi_pos.shape[1] + 1)
-                            ],
-                        )
-                    )
-                with st.spinner("Processing ICU Schedule..."):
-                    icu_pos, _ = WWO_Class_Dict["ICU"].optimize()
-                    '''
-                    icu_plot_text.subheader("ICU WWO Plot")
-                    data_icu = pd.DataFrame(
-                        {
-                            "Cost Jadwal 2 Unit ICU": WWO_Class_Dict[
-                                "ICU"
-                            ].best_fit_iteration,
-                            "Iteration": np.arange(st.session_state["iter"] + 1),
-                        }
-                    )
-                    chart_icu = (
-                        alt.Chart(data_icu)
-                        .mark_line()
-                        .encode(x="Iteration", y="Cost Jadwal 2 Unit ICU")
-                    )
-                    icu_plot.altair_chart(chart_icu, use_container_width=True)
-                    '''
-                    icu_cost_text.subheader("ICU With WWO"
-                       # f"""Cost {max(WWO_Class_Dict["ICU"].best_fit_iteration)} -> {min(WWO_Class_Dict["ICU"].best_fit_iteration)}"""
-                    )
-                    icu_2.dataframe(
-                        pd.DataFrame(
-                            icu_pos,
-                            index=[
-                                "Perawat " + str(i)
-                                for i in np.arange(1, icu_pos.shape[0] + 1)
-                            ],
-                            columns=[
-                                "Hari " + str(i)
-                                for i in np.arange(1, icu_pos.shape[1] + 1)
-                            ],
-                        )
-                    )
-                with st.spinner("Processing OK Schedule..."):
-                    ok_pos, _ = WWO_Class_Dict["OK"].optimize()
-                    '''
-                    ok_plot_text.subheader("OK WWO Plot")
-                    data_ok = pd.DataFrame(
-                        {
-                            "Cost Jadwal 2 Unit OK": WWO_Class_Dict[
-                                "OK"
-                            ].best_fit_iteration,
-                            "Iteration": np.arange(st.session_state["iter"] + 1),
-                        }
-                    )
-                    chart_ok = (
-                        alt.Chart(data_ok)
-                        .mark_line()
-                        .encode(x="Iteration", y="Cost Jadwal 2 Unit OK")
-                    )
-                    ok_plot.altair_chart(chart_ok, use_container_width=True)
-                    '''
-                    ok_cost_text.subheader("OK With WWO"
-                       # f"""Cost {max(WWO_Class_Dict["OK"].best_fit_iteration)} -> {min(WWO_Class_Dict["OK"].best_fit_iteration)}"""
-                    )
-                    ok_2.dataframe(
-                        pd.DataFrame(
-                            ok_pos,
-                            index=[
-                                "Perawat " + str(i)
-                                for i in np.arange(1, ok_pos.shape[0] + 1)
-                            ],
-                            columns=[
-                                "Hari " + str(i)
-                                for i in np.arange(1, ok_pos.shape[1] + 1)
-                            ],
-                        )
-                    )
+                cost_text.subheader(f"{unit} With WWO")
+                schedule.dataframe(self.schedule_dataframe(result["best_pos"]))
 
 
 if __name__ == "__main__":
@@ -0,0 +1,504 @@
+import timeit
+
+import numpy as np
+import pytest
+
+from backend import (
+    FitnessCache,
+    IslandWWO,
+    NSP_Class,
+    WWO,
+    PackedSchedule,
+    shift_label,
+    to_shift_code,
+)
+
+DAY = 14
+TOTAL_NURSE = 8
+
+
+def make_nsp(boundary: bool = False, cost_backend: str = "numpy") -> NSP_Class:
+    NSP = NSP_Class(
+        DAY,
+        "Test",
+        TOTAL_NURSE,
+        np.array([2, 2, 1, 0]),
+        5,
+        1,
+        seed=0,
+        window_rules=(
+            NSP_Class.max_consecutive_work_rule(5),
+            NSP_Class.min_days_off_rule(2, penalty=1, hard=False),
+        ),
+        generator="constructive",
+        cost_backend=cost_backend,
+    )
+    if boundary:
+        NSP.set_previous_schedule(
+            np.random.default_rng(1).integers(0, 4, (TOTAL_NURSE, DAY))
+        )
+    return NSP
+
+
+def random_population(rng, size: int) -> np.ndarray:
+    return rng.integers(0, 4, (size, TOTAL_NURSE, DAY))
+
+
+@pytest.mark.parametrize("boundary", [False, True])
+def test_numba_matches_numpy(boundary):
+    pytest.importorskip("numba")
+    rng = np.random.default_rng(2)
+    population = random_population(rng, 20)
+    cost, breakdown = make_nsp(boundary).cost_batch(population)
+    cost_numba, breakdown_numba = make_nsp(boundary, "numba").cost_batch(population)
+    np.testing.assert_allclose(cost_numba, cost)
+    np.testing.assert_allclose(breakdown_numba, breakdown)
+
+
+@pytest.mark.parametrize("mode", ["continuous", "discrete"])
+def test_breaking_matches_sequential(mode):
+    NSP = make_nsp()
+    data_rng = np.random.default_rng(4)
+    for seed in range(20):
+        wwo = WWO(
+            NSP, 10, 6.0, 0.5, 1.001, 1e-31, 0.01, 0.001, 30, 4, 0, mode=mode, seed=seed
+        )
+        pos = data_rng.integers(0, 4, TOTAL_NURSE * DAY)
+        pos = pos.astype(np.uint8 if mode == "discrete" else np.float64)
+        fit = NSP.cost(pos)
+
+        # Breaking dengan menerapkan tetangga satu per satu dan menghitung cost penuh
+        rng = np.random.default_rng(seed)
+        k = rng.integers(1, wwo.k_max)
+        cells = rng.choice(pos.shape[0], size=k, replace=False)
+        if mode == "discrete":
+            values = (pos[cells].astype(int) + rng.integers(1, 4, size=k)) % 4
+        else:
+            values = pos[cells] + rng.standard_normal(k) * 0.3 * 4
+        expected_pos, expected_fit = pos.copy(), fit
+        for cell, value in zip(cells, values):
+            candidate = expected_pos.copy()
+            candidate[cell] = value
+            candidate_fit = NSP.cost(candidate)
+            if candidate_fit < expected_fit:
+                expected_pos, expected_fit = candidate, candidate_fit
+
+        new_pos, new_fit, _ = wwo.breaking(pos.copy(), fit, 0.5, 0.3, NSP)
+        np.testing.assert_array_equal(to_shift_code(new_pos), to_shift_code(expected_pos))
+        assert new_fit == pytest.approx(expected_fit)
+        assert new_fit == pytest.approx(NSP.cost(new_pos))
+
+
+@pytest.mark.parametrize("boundary", [False, True])
+def test_delta_matches_full_cost(boundary):
+    rng = np.random.default_rng(3)
+    NSP = make_nsp(boundary)
+    nurse_array = random_population(rng, 1)[0]
+    delta_cost = NSP.delta_state(nurse_array)
+    for _ in range(50):
+        nurses = rng.integers(TOTAL_NURSE, size=10)
+        days = rng.integers(DAY, size=10)
+        shifts = rng.integers(0, 4, size=10)
+        expected = []
+        for nurse, day, shift in zip(nurses, days, shifts):
+            changed = nurse_array.copy()
+            changed[nurse, day] = shift
+            expected.append(NSP.cost(changed) - delta_cost.cost)
+        np.testing.assert_allclose(delta_cost.delta_batch(nurses, days, shifts), expected)
+        assert delta_cost.delta(nurses[0], days[0], shifts[0]) == pytest.approx(
+            expected[0]
+        )
+
+        nurse_array[nurses[0], days[0]] = shifts[0]
+        assert delta_cost.apply(nurses[0], days[0], shifts[0]) == pytest.approx(
+            NSP.cost(nurse_array)
+        )
+
+
+def test_delta_faster_than_full_cost():
+    # Delta satu sel harus beberapa operasi per perubahan, bukan seharga cost penuh
+    rng = np.random.default_rng(6)
+    NSP = make_nsp()
+    nurse_array = random_population(rng, 1)[0]
+    delta_cost = NSP.delta_state(nurse_array)
+    cells = [
+        (rng.integers(TOTAL_NURSE), rng.integers(DAY), rng.integers(0, 4))
+        for _ in range(100)
+    ]
+    delta_time = min(
+        timeit.repeat(
+            lambda: [delta_cost.delta(*cell) for cell in cells], number=3, repeat=5
+        )
+    )
+    cost_time = min(
+        timeit.repeat(lambda: [NSP.cost(nurse_array) for _ in cells], number=3, repeat=5)
+    )
+    assert delta_time < cost_time
+
+
+@pytest.mark.parametrize("boundary", [False, True])
+def test_bounded_cost(boundary):
+    rng = np.random.default_rng(5)
+    NSP = make_nsp(boundary)
+    population = random_population(rng, 50)
+    cost, breakdown = NSP.compute_cost_batch(population)
+    upper_bound = rng.uniform(cost.min() - 10, cost.max() + 10, size=len(cost))
+    bounded_cost, bounded_breakdown, complete = NSP.bounded_cost_batch(
+        population, upper_bound
+    )
+    assert np.all(bounded_cost <= cost + 1e-9)
+    assert np.all(complete[cost < upper_bound])
+    assert np.all(bounded_cost[~complete] >= upper_bound[~complete])
+    np.testing.assert_allclose(bounded_cost[complete], cost[complete])
+    np.testing.assert_allclose(bounded_breakdown[complete], breakdown[complete])
+
+
+@pytest.mark.parametrize("boundary", [False, True])
+def test_swap_matches_full_cost(boundary):
+    rng = np.random.default_rng(7)
+    NSP = make_nsp(boundary)
+    nurse_array = random_population(rng, 1)[0]
+    delta_cost = NSP.delta_state(nurse_array)
+    for _ in range(20):
+        day = rng.integers(DAY)
+        matrix = delta_cost.swap_delta_matrix(day)
+        nurse_a, nurse_b = rng.choice(TOTAL_NURSE, size=2, replace=False)
+        swapped = nurse_array.copy()
+        swapped[[nurse_a, nurse_b], day] = swapped[[nurse_b, nurse_a], day]
+        assert matrix[nurse_a, nurse_b] == pytest.approx(
+            NSP.cost(swapped) - delta_cost.cost
+        )
+        assert delta_cost.apply_swap(nurse_a, nurse_b, day) == pytest.approx(
+            NSP.cost(swapped)
+        )
+        nurse_array = swapped
+
+
+def test_local_search_keeps_coverage():
+    NSP = make_nsp()
+    wwo = WWO(NSP, 10, 6.0, 0.5, 1.001, 1e-31, 0.01, 0.001, 30, 4, 0, seed=8)
+    pos = np.random.default_rng(8).integers(0, 4, TOTAL_NURSE * DAY).astype(np.uint8)
+    before = pos.reshape(TOTAL_NURSE, DAY).copy()
+    fit = NSP.cost(pos)
+    new_pos, new_fit = wwo.local_search(pos, fit)
+    after = new_pos.reshape(TOTAL_NURSE, DAY)
+    assert new_fit <= fit
+    assert new_fit == pytest.approx(NSP.cost(new_pos))
+    np.testing.assert_array_equal(np.sort(after, axis=0), np.sort(before, axis=0))
+
+
+@pytest.mark.parametrize("generator", ["constructive", "repair"])
+def test_population_keeps_first_schedule(generator):
+    NSP = NSP_Class(
+        DAY,
+        "Test",
+        TOTAL_NURSE,
+        np.array([2, 2, 1, 0]),
+        5,
+        1,
+        seed=9,
+        generator=generator,
+    )
+    first_schedule = NSP.nurse_array_col.copy()
+    np.testing.assert_array_equal(
+        first_schedule,
+        shift_label(NSP.nurse_first_schedule.reshape(TOTAL_NURSE, DAY)),
+    )
+    wwo = WWO(NSP, 3, 6.0, 0.5, 1.001, 1e-31, 0.01, 0.001, 30, 4, 0, x_population=5)
+    wwo.optimize()
+    np.testing.assert_array_equal(NSP.nurse_array_col, first_schedule)
+
+
+def reference_breakdown(NSP, nurse_array, previous_schedule=None) -> np.ndarray:
+    # Cost tiap constraint dihitung langsung per perawat dan per pola/jendela
+    rows = np.asarray(nurse_array)
+    boundary_days = 0
+    if previous_schedule is not None:
+        boundary_days = NSP.rule_span - 1
+        rows = np.hstack((previous_schedule[:, -boundary_days:], rows))
+    breakdown = [0, 0]
+    for day in range(NSP.day):
+        for shift in range(3):
+            count = np.count_nonzero(nurse_array[:, day] == shift)
+            breakdown[0] += max(NSP.unit_minimum_shift[shift] - count, 0)
+    for _, pattern, penalty, _ in NSP.transition_rules:
+        cost = 0
+        for row in rows:
+            for start in range(max(boundary_days - len(pattern) + 1, 0), len(row)):
+                cells = row[start : start + len(pattern)]
+                cost += len(cells) == len(pattern) and all(
+                    cell in np.atleast_1d(shift) for cell, shift in zip(cells, pattern)
+                )
+        breakdown.append(penalty * cost)
+    for _, shifts, window, limit, penalty, _ in NSP.window_rules:
+        cost = 0
+        for row in rows:
+            for start in range(max(boundary_days - window + 1, 0), len(row) - window + 1):
+                count = sum(cell in shifts for cell in row[start : start + window])
+                cost += max(count - limit, 0)
+        breakdown.append(penalty * cost)
+    return np.array(breakdown)
+
+
+def test_rule_costs_match_reference():
+    rng = np.random.default_rng(10)
+    NSP = make_nsp()
+    assert "hard_constraint_cost_two_night_holiday" in NSP.constraint_names
+    population = random_population(rng, 20)
+    _, breakdown = NSP.cost_batch(population)
+    for nurse_array, expected in zip(population, breakdown):
+        np.testing.assert_allclose(reference_breakdown(NSP, nurse_array), expected)
+
+
+def test_feasibility_flags_two_night_holiday():
+    # Tanpa sisa perawat, malam harus dilanjutkan sore sehingga malam > sore melanggar HC4
+    with pytest.raises(ValueError, match="Dua malam lalu libur"):
+        NSP_Class(30, "Test", 10, np.array([3, 3, 4, 0]), 5, 1, generator="constructive")
+    NSP = NSP_Class(
+        30,
+        "Test",
+        10,
+        np.array([3, 3, 4, 0]),
+        5,
+        1,
+        generator="constructive",
+        on_infeasible="best_effort",
+    )
+    _, breakdown = NSP.cost_batch(NSP.nurse_first_schedule[None])
+    hard_cost = breakdown[0, NSP.hard_constraint_mask].sum()
+    assert hard_cost >= NSP.feasibility["hard_cost_lower_bound"] > 0
+    assert NSP_Class(
+        30, "Test", 10, np.array([3, 3, 3, 0]), 5, 1, generator="constructive"
+    ).feasibility["feasible"]
+
+
+def test_packed_schedule_indexing():
+    rng = np.random.default_rng(11)
+    population = random_population(rng, 7).astype(np.uint8)
+    packed = PackedSchedule.pack(population)
+    np.testing.assert_array_equal(np.asarray(packed), population)
+    for index in (
+        0,
+        -1,
+        slice(1, 5),
+        slice(None, None, 2),
+        [4, 0, 2],
+        (3, 2),
+        (slice(0, 3), 1),
+    ):
+        np.testing.assert_array_equal(packed[index], population[index])
+    with pytest.raises(IndexError):
+        packed[7]
+
+
+@pytest.mark.parametrize("generator", ["constructive", "repair"])
+def test_infeasible_unit(generator):
+    # 2 + 2 + 1 shift per hari tidak dapat dipenuhi oleh 4 perawat
+    with pytest.raises(ValueError, match="Kapasitas per hari"):
+        NSP_Class(DAY, "Test", 4, np.array([2, 2, 1, 0]), 5, 1, generator=generator)
+    NSP = NSP_Class(
+        DAY,
+        "Test",
+        4,
+        np.array([2, 2, 1, 0]),
+        5,
+        1,
+        seed=12,
+        generator=generator,
+        on_infeasible="best_effort",
+    )
+    assert not NSP.feasibility["feasible"] and NSP.feasibility["problems"]
+    _, breakdown = NSP.cost_batch(NSP.nurse_first_schedule[None])
+    hard_cost = breakdown[0, NSP.hard_constraint_mask].sum()
+    assert hard_cost >= NSP.feasibility["hard_cost_lower_bound"] > 0
+
+
+def test_repair_generator_is_bounded(monkeypatch):
+    # Batas iterasi perbaikan acak tercapai: unit feasible memakai generator
+    # konstruktif, unit tidak feasible tetap selesai dengan jadwal best-effort
+    monkeypatch.setattr(NSP_Class, "repair_max_iteration", 1)
+    NSP = NSP_Class(30, "Test", 38, np.array([10, 10, 8, 0]), 5, 1, seed=1)
+    rng = np.random.default_rng(0)
+    repaired = NSP.generate_initial_first_schedule(max_iteration=1, rng=rng)
+    assert NSP.minimum_shift_cost_batch(repaired.reshape(1, 38, 30))[0][0] > 0
+    _, breakdown = NSP.cost_batch(NSP.nurse_first_schedule[None])
+    assert breakdown[0, 0] == 0
+
+    NSP = NSP_Class(
+        30, "Test", 10, np.array([4, 2, 4, 0]), 5, 1, seed=1, on_infeasible="best_effort"
+    )
+    assert NSP.nurse_first_schedule.shape == (10 * 30,)
+
+
+@pytest.mark.parametrize("mode", ["continuous", "discrete"])
+def test_resume_matches_uninterrupted_run(mode, tmp_path):
+    def make_wwo(**kwargs):
+        return WWO(
+            make_nsp(),
+            20,
+            6.0,
+            0.5,
+            1.001,
+            1e-31,
+            0.01,
+            0.001,
+            12,
+            4,
+            0,
+            x_population=4,
+            mode=mode,
+            seed=13,
+            **kwargs,
+        )
+
+    wwo = make_wwo()
+    best_pos, best_fit = wwo.optimize()
+
+    # Optimasi dihentikan setelah checkpoint iterasi ke-10, lalu dilanjutkan oleh
+    # objek baru dari checkpoint tersebut
+    path = str(tmp_path / "checkpoint.npz")
+    interrupted = make_wwo(checkpoint_path=path, checkpoint_every=5)
+    for snapshot in interrupted.iterate():
+        if snapshot["iteration"] == 12:
+            break
+    resumed = make_wwo()
+    resumed_pos, resumed_fit = resumed.resume(path)
+    assert resumed_fit == best_fit
+    np.testing.assert_array_equal(resumed_pos, best_pos)
+    assert list(resumed.best_fit_iteration) == list(wwo.best_fit_iteration)
+
+
+@pytest.mark.parametrize("topology", ["ring", "full"])
+def test_islands_serial_matches_parallel(topology):
+    params = dict(
+        iteration=20,
+        hmax=6.0,
+        lambd=0.5,
+        alpha=1.001,
+        epsilon=1e-31,
+        beta_max=0.01,
+        beta_min=0.001,
+        k_max=12,
+        upper_bound=4,
+        lower_bound=0,
+        x_population=4,
+        mode="discrete",
+    )
+    results = []
+    for workers in (1, 3):
+        model = IslandWWO(make_nsp(), 3, 5, topology=topology, workers=workers, seed=14, **params)
+        best_pos, best_fit = model.optimize()
+        results.append((best_pos, best_fit, model.island_histories))
+    (serial_pos, serial_fit, serial_histories), (parallel_pos, parallel_fit, parallel_histories) = results
+    assert serial_fit == parallel_fit
+    np.testing.assert_array_equal(serial_pos, parallel_pos)
+    assert serial_histories == parallel_histories
+
+
+def test_cost_cache_invalidation():
+    rng = np.random.default_rng(20)
+    schedule = rng.integers(0, 4, TOTAL_NURSE * DAY)
+    previous_schedule = rng.integers(0, 4, (TOTAL_NURSE, DAY))
+    window_rules = (NSP_Class.max_consecutive_work_rule(4),)
+    transition_rules = NSP_Class.transition_rules[:2]
+
+    def fresh(**kwargs):
+        return NSP_Class(
+            DAY,
+            "Test",
+            TOTAL_NURSE,
+            np.array([2, 2, 1, 0]),
+            kwargs.pop("hard_constraint_multiplier", 5),
+            1,
+            seed=0,
+            generator="constructive",
+            **kwargs,
+        )
+
+    # Setiap perubahan harus membuang cost yang sudah tersimpan di cache, sehingga
+    # hasilnya sama dengan NSP baru yang dibuat dengan konfigurasi akhir
+    NSP = fresh(cache_size=100)
+    NSP.cost(schedule)
+    NSP.set_previous_schedule(previous_schedule)
+    assert NSP.cost(schedule) == fresh(previous_schedule=previous_schedule).cost(schedule)
+
+    NSP.build_window_table(window_rules)
+    expected = fresh(previous_schedule=previous_schedule, window_rules=window_rules)
+    assert NSP.cost(schedule) == expected.cost(schedule)
+
+    NSP.build_transition_table(transition_rules)
+    expected = fresh(
+        previous_schedule=previous_schedule,
+        window_rules=window_rules,
+        transition_rules=transition_rules,
+    )
+    assert NSP.cost(schedule) == expected.cost(schedule)
+
+    NSP.hard_constraint_multiplier = 0
+    expected = fresh(
+        hard_constraint_multiplier=0,
+        previous_schedule=previous_schedule,
+        window_rules=window_rules,
+        transition_rules=transition_rules,
+    )
+    assert NSP.cost(schedule) == expected.cost(schedule)
+
+
+def test_cost_cache_invalidated_on_backend_change():
+    pytest.importorskip("numba")
+    NSP = make_nsp()
+    NSP.cost_cache = FitnessCache(100)
+    schedule = np.random.default_rng(21).integers(0, 4, TOTAL_NURSE * DAY)
+    NSP.cost(schedule)
+    NSP.cost(schedule)
+    assert NSP.cache_stats()["hits"] == 1
+    NSP.set_cost_backend("numba")
+    assert NSP.cache_stats()["size"] == 0
+    assert NSP.cost(schedule) == make_nsp(cost_backend="numba").cost(schedule)
+    assert NSP.cache_stats()["misses"] == 2
+
+
+@pytest.mark.parametrize("boundary", [False, True])
+@pytest.mark.parametrize("continuous", [False, True])
+def test_repair_batch_removes_transition_violations(boundary, continuous):
+    NSP = make_nsp(boundary)
+    rng = np.random.default_rng(23)
+    population = rng.integers(0, 4, (50, TOTAL_NURSE * DAY)).astype(np.float64)
+    if continuous:
+        population += rng.uniform(-0.4, 0.4, population.shape)
+    _, breakdown = NSP.cost_batch(population)
+    repaired = NSP.repair_batch(population, rng=np.random.default_rng(0))
+    _, repaired_breakdown = NSP.cost_batch(repaired)
+
+    # Perbaikan menghapus seluruh pelanggaran HC3 dan HC4 tanpa menambah kekurangan
+    # minimum shift, sel yang tidak diubah (termasuk nilai pecahan) tetap sama
+    for name in ("hard_constraint_cost_night_day", "hard_constraint_cost_two_night_holiday"):
+        assert not repaired_breakdown[:, NSP.constraint_names.index(name)].any()
+    assert np.all(repaired_breakdown[:, 0] <= breakdown[:, 0])
+    assert repaired.dtype == population.dtype
+    changed = to_shift_code(repaired) != to_shift_code(population)
+    np.testing.assert_array_equal(repaired[~changed], population[~changed])
+
+
+def test_boundary_costs_match_reference():
+    rng = np.random.default_rng(25)
+    population = random_population(rng, 20)
+    previous_schedule = rng.integers(0, 4, (TOTAL_NURSE, DAY))
+    NSP = make_nsp()
+    NSP.set_previous_schedule(shift_label(previous_schedule))
+    _, breakdown = NSP.cost_batch(population)
+    for nurse_array, expected in zip(population, breakdown):
+        np.testing.assert_allclose(
+            reference_breakdown(NSP, nurse_array, previous_schedule), expected
+        )
+
+    # Jadwal sebelumnya yang lebih pendek dan dengan perawat lebih sedikit diisi
+    # kode 4 (bukan shift)
+    boundary_days = NSP.rule_span - 1
+    short = previous_schedule[: TOTAL_NURSE - 2, -(boundary_days - 1) :]
+    NSP.set_previous_schedule(short)
+    padded = np.full((TOTAL_NURSE, boundary_days), 4)
+    padded[: TOTAL_NURSE - 2, 1:] = short
+    _, breakdown = NSP.cost_batch(population)
+    for nurse_array, expected in zip(population, breakdown):
+        np.testing.assert_allclose(reference_breakdown(NSP, nurse_array, padded), expected)